@@ -1,38 +1,66 @@
-import asyncio
 import sys
 
-import typer
-from pyee import EventEmitter
-
-from europa1400_manager.cli import Cli
-from europa1400_manager.config import Config
 from europa1400_manager.const import AppMode
-from europa1400_manager.database import Database
-from europa1400_manager.gui import Gui
+from europa1400_manager.daemon_client import DaemonClient
+from europa1400_manager.profiler import Profiler
+from europa1400_manager.utils import EnvUtils
+
+# Everything else is imported once the command runs in this process, so that
+# commands forwarded to a daemon only pay for the modules above.
+
+
+async def main(app_mode: AppMode = AppMode.CLI) -> int:
+    with Profiler.span("import"):
+        from pyee import EventEmitter
 
+        from europa1400_manager.cli import Cli
+        from europa1400_manager.config import Config
+        from europa1400_manager.database import Database
 
-async def main(app_mode: AppMode = AppMode.CLI) -> None:
-    config = Config.load(app_mode)
+    with Profiler.span("load config"):
+        config = Config.load(app_mode)
     database = Database()
-    await database.init()
     event_emitter = EventEmitter()
 
     if app_mode is AppMode.GUI:
+        with Profiler.span("import gui"):
+            from europa1400_manager.gui import Gui
+
         gui = Gui(config, database, event_emitter)
         await gui.run()
-    else:
-        cli = Cli(config, database)
-        await cli.run()
+        return 0
+
+    cli = Cli(config, database)
+    return await cli.run()
+
+
+def run(app_mode: AppMode) -> int:
+    """Run the manager in this process and return its exit code."""
+    import asyncio
+
+    import typer
+
+    try:
+        return asyncio.run(main(app_mode=app_mode))
+    except typer.Exit as e:
+        return e.exit_code
 
 
 if __name__ == "__main__":
+    profile, trace_path = Profiler.pop_args(sys.argv)
+    if profile:
+        Profiler.start()
+    elif sys.argv[1:2] not in (["--gui"], ["serve"]):
+        exit_code = DaemonClient(EnvUtils.get_daemon_socket_path()).run(
+            sys.argv[1:], EnvUtils.get_daemon_environment()
+        )
+        if exit_code is not None:
+            sys.exit(exit_code)
+
     try:
-        asyncio.run(
-            main(
-                app_mode=AppMode.GUI
-                if len(sys.argv) > 1 and sys.argv[1] == "--gui"
-                else AppMode.CLI
-            )
+        exit_code = run(
+            AppMode.GUI if len(sys.argv) > 1 and sys.argv[1] == "--gui" else AppMode.CLI
         )
-    except typer.Exit:
-        pass
+    finally:
+        Profiler.report(trace_path)
+    sys.exit(exit_code)
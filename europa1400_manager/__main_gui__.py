@@ -1,21 +1,26 @@
 """GUI entry point for europa1400-manager."""
 
 import asyncio
+import sys
 
 import typer
-from pyee import EventEmitter
 
-from europa1400_manager.config import Config
 from europa1400_manager.const import AppMode
-from europa1400_manager.database import Database
-from europa1400_manager.gui import Gui
+from europa1400_manager.profiler import Profiler
 
 
 async def main() -> None:
     """Main entry point for GUI mode."""
-    config = Config.load(AppMode.GUI)
+    with Profiler.span("import"):
+        from pyee import EventEmitter
+
+        from europa1400_manager.config import Config
+        from europa1400_manager.database import Database
+        from europa1400_manager.gui import Gui
+
+    with Profiler.span("load config"):
+        config = Config.load(AppMode.GUI)
     database = Database()
-    await database.init()
     event_emitter = EventEmitter()
 
     gui = Gui(config, database, event_emitter)
@@ -23,7 +28,13 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
+    profile, trace_path = Profiler.pop_args(sys.argv)
+    if profile:
+        Profiler.start()
+
     try:
         asyncio.run(main())
     except typer.Exit:
         pass
+    finally:
+        Profiler.report(trace_path)
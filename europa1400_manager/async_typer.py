@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-import concurrent.futures
+import contextvars
 import inspect
 from functools import partial, wraps
 from typing import Any, Callable
@@ -10,32 +10,61 @@ from typer import Typer
 
 
 class AsyncTyper(Typer):
+    """Typer app that accepts coroutine functions as commands.
+
+    Without a running event loop, a command runs to completion as usual. When
+    it is dispatched from a running loop, it returns an awaitable instead:
+    coroutine commands are returned unawaited, and sync commands are submitted
+    to the loop's default executor. The caller awaits the result, so commands
+    share the loop and everything bound to it. Callbacks must be sync.
+    """
+
     @staticmethod
     def maybe_run_async(decorator: Callable[..., Any], func: Callable[..., Any]) -> Any:
         if inspect.iscoroutinefunction(func):
 
             @wraps(func)
             def runner(*args: Any, **kwargs: Any) -> Any:
+                coroutine = func(*args, **kwargs)
                 try:
                     asyncio.get_running_loop()
-
-                    def run_in_thread() -> Any:
-                        return asyncio.run(func(*args, **kwargs))
-
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(run_in_thread)
-                        return future.result()
                 except RuntimeError:
-                    return asyncio.run(func(*args, **kwargs))
+                    return asyncio.run(coroutine)
+                return coroutine
 
             decorator(runner)
         else:
-            decorator(func)
+
+            @wraps(func)
+            def sync_runner(*args: Any, **kwargs: Any) -> Any:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    return func(*args, **kwargs)
+                context = contextvars.copy_context()
+                return loop.run_in_executor(
+                    None, partial(context.run, func, *args, **kwargs)
+                )
+
+            decorator(sync_runner)
+        return func
+
+    @staticmethod
+    def sync_callback(decorator: Callable[..., Any], func: Callable[..., Any]) -> Any:
+        """Register a callback, which must be a plain function.
+
+        Click ignores what a group callback returns, so a coroutine callback
+        could never be awaited on the loop that dispatches the command.
+        """
+        if inspect.iscoroutinefunction(func):
+            raise TypeError(f"Callback {func.__name__} must not be a coroutine.")
+
+        decorator(func)
         return func
 
     def callback(self, *args: Any, **kwargs: Any) -> Any:
         decorator = super().callback(*args, **kwargs)
-        return partial(self.maybe_run_async, decorator)
+        return partial(self.sync_callback, decorator)
 
     def command(self, *args: Any, **kwargs: Any) -> Any:
         decorator = super().command(*args, **kwargs)
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import shlex
+import time
+import traceback
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from europa1400_manager.streams import set_context_streams
+
+if TYPE_CHECKING:
+    from europa1400_manager.cli import Cli
+
+
+@dataclass
+class BatchResult:
+    """Outcome and captured output of one command of a batch."""
+
+    index: int
+    args: list[str]
+    exit_code: int = 0
+    stdout: str = ""
+    stderr: str = ""
+    elapsed: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "args": self.args,
+            "exit_code": self.exit_code,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "elapsed": round(self.elapsed, 6),
+        }
+
+
+class BatchRunner:
+    """Runs a sequence of CLI commands in one process.
+
+    All commands share the configuration, the database and the modules of one
+    :class:`Cli`. Up to ``concurrency`` commands run at the same time, each
+    with its own captured output, and results are yielded in input order.
+    Standard streams must be context streams while the batch runs.
+    """
+
+    NESTED_COMMANDS = {"batch", "serve"}
+
+    def __init__(self, cli: Cli, concurrency: int = 1) -> None:
+        self.cli = cli
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    @staticmethod
+    def parse(text: str) -> list[list[str]]:
+        """Parse a JSON list of commands, or one shell-quoted command per line.
+
+        In a JSON list, a command is either a string or a list of arguments.
+        Empty lines and ``#`` comments are skipped.
+        """
+        if text.lstrip().startswith(("[", "{")):
+            data = json.loads(text)
+            if not isinstance(data, list):
+                raise ValueError("Expected a JSON list of commands.")
+
+            commands: list[list[str]] = []
+            for command in data:
+                if isinstance(command, str):
+                    commands.append(shlex.split(command))
+                elif isinstance(command, list):
+                    commands.append([str(arg) for arg in command])
+                else:
+                    raise ValueError(f"Expected a command string or list: {command!r}")
+            return commands
+
+        lines = [shlex.split(line, comments=True) for line in text.splitlines()]
+        return [args for args in lines if args]
+
+    async def run(self, commands: list[list[str]]) -> AsyncIterator[BatchResult]:
+        """Run the commands and yield their results in input order."""
+        tasks = [
+            asyncio.create_task(self._run_command(index, args))
+            for index, args in enumerate(commands)
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_command(self, index: int, args: list[str]) -> BatchResult:
+        async with self._semaphore:
+            result = BatchResult(index, args)
+            stdout, stderr = io.StringIO(), io.StringIO()
+            set_context_streams(io.StringIO(), stdout, stderr)
+
+            start = time.perf_counter()
+            if args[:1] and args[0] in self.NESTED_COMMANDS:
+                stderr.write(f"{args[0]} cannot run inside a batch.\n")
+                result.exit_code = 2
+            else:
+                try:
+                    result.exit_code = await self.cli.run(args)
+                except Exception:
+                    traceback.print_exc()
+                    result.exit_code = 1
+
+            result.elapsed = time.perf_counter() - start
+            result.stdout = stdout.getvalue()
+            result.stderr = stderr.getvalue()
+            return result
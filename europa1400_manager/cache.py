@@ -0,0 +1,138 @@
+import contextlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from dataclass_wizard import JSONWizard
+
+
+@dataclass
+class CacheEntryMetadata(JSONWizard):
+    """HTTP validators and bookkeeping stored next to a cached file."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+    size: int = 0
+    missing: bool = False
+
+
+@dataclass
+class CacheEntry:
+    """A cached database file together with its metadata."""
+
+    file_name: str
+    data: bytes
+    metadata: CacheEntryMetadata
+
+
+class DatabaseCache:
+    """On-disk cache of raw database files keyed by file name."""
+
+    METADATA_SUFFIX = ".meta.json"
+
+    def __init__(self, path: Path, max_age: float = 0.0) -> None:
+        self.path = path
+        self.max_age = max_age
+
+    def read(self, file_name: str, url: str) -> CacheEntry | None:
+        """Return the cached copy of ``file_name`` if it was fetched from ``url``."""
+        data_path = self._data_path(file_name)
+        metadata_path = self._metadata_path(file_name)
+
+        try:
+            metadata = CacheEntryMetadata.from_json(metadata_path.read_text())
+            if not isinstance(metadata, CacheEntryMetadata) or metadata.url != url:
+                return None
+            data = b"" if metadata.missing else data_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+        return CacheEntry(file_name=file_name, data=data, metadata=metadata)
+
+    def write(self, file_name: str, data: bytes, metadata: CacheEntryMetadata) -> None:
+        """Store ``data`` and its metadata, replacing any previous entry."""
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        metadata.fetched_at = time.time()
+        metadata.size = len(data)
+
+        self._write_atomic(self._data_path(file_name), data)
+        self._write_atomic(
+            self._metadata_path(file_name), metadata.to_json().encode("utf-8")
+        )
+
+    def write_missing(self, file_name: str, url: str) -> None:
+        """Record that ``file_name`` does not exist at ``url``."""
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._data_path(file_name).unlink(missing_ok=True)
+        metadata = CacheEntryMetadata(url=url, fetched_at=time.time(), missing=True)
+        self._write_atomic(
+            self._metadata_path(file_name), metadata.to_json().encode("utf-8")
+        )
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Mark a cached entry as revalidated just now."""
+        entry.metadata.fetched_at = time.time()
+        self._write_atomic(
+            self._metadata_path(entry.file_name),
+            entry.metadata.to_json().encode("utf-8"),
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Check whether an entry may be used without revalidating it."""
+        return time.time() - entry.metadata.fetched_at < self.max_age
+
+    def read_fresh(self, file_name: str, url: str) -> CacheEntry | None:
+        """Return the cached copy of ``file_name`` if it needs no revalidation."""
+        entry = self.read(file_name, url)
+        return entry if entry is not None and self.is_fresh(entry) else None
+
+    def entries(self) -> list[CacheEntryMetadata]:
+        """Return the metadata of all cached files."""
+        if not self.path.is_dir():
+            return []
+
+        entries: list[CacheEntryMetadata] = []
+        for metadata_path in sorted(self.path.glob(f"*{self.METADATA_SUFFIX}")):
+            try:
+                metadata = CacheEntryMetadata.from_json(metadata_path.read_text())
+            except (OSError, ValueError):
+                continue
+            if isinstance(metadata, CacheEntryMetadata):
+                entries.append(metadata)
+
+        return entries
+
+    def clear(self) -> None:
+        """Remove all cached files.
+
+        Only entries written by the cache are deleted, since the cache path may
+        point to a directory holding other files. The directory itself is
+        removed only if nothing else is left in it.
+        """
+        if not self.path.is_dir():
+            return
+
+        for metadata_path in self.path.glob(f"*{self.METADATA_SUFFIX}"):
+            file_name = metadata_path.name.removesuffix(self.METADATA_SUFFIX)
+            self._data_path(file_name).unlink(missing_ok=True)
+            metadata_path.unlink(missing_ok=True)
+
+        with contextlib.suppress(OSError):
+            self.path.rmdir()
+
+    def _data_path(self, file_name: str) -> Path:
+        return self.path / file_name
+
+    def _metadata_path(self, file_name: str) -> Path:
+        return self.path / f"{file_name}{self.METADATA_SUFFIX}"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,180 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar
+
+from dataclass_wizard import JSONWizard
+
+from europa1400_manager.const import HashAlgorithm
+from europa1400_manager.hashing import FileHasher
+
+
+@dataclass
+class ChecksumCacheEntry(JSONWizard):
+    """Checksums of a file together with the stat data they were computed for."""
+
+    size: int
+    mtime_ns: int
+    inode: int
+    checksums: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_stat(cls, stat_result: os.stat_result) -> "ChecksumCacheEntry":
+        return cls(
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            inode=stat_result.st_ino,
+        )
+
+    def matches(self, stat_result: os.stat_result) -> bool:
+        """Check whether the file is unchanged since the checksums were computed."""
+        return (
+            self.size == stat_result.st_size
+            and self.mtime_ns == stat_result.st_mtime_ns
+            and self.inode == stat_result.st_ino
+        )
+
+
+@dataclass
+class ChecksumCacheData(JSONWizard):
+    entries: dict[str, ChecksumCacheEntry] = field(default_factory=dict)
+
+
+class ChecksumCache:
+    """Persistent cache of file checksums keyed by absolute path and stat data.
+
+    The cache may be shared by detections running in several threads.
+    """
+
+    FILE_NAME = "checksums.json"
+
+    _instances: ClassVar[dict[Path, "ChecksumCache"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._data: ChecksumCacheData | None = None
+        self._is_dirty = False
+        self._lock = threading.RLock()
+
+    @classmethod
+    def open(cls, path: Path) -> "ChecksumCache":
+        """Get the cache of a file, shared by everything in this process.
+
+        Separate instances over one file would overwrite each other's entries
+        whenever they save.
+        """
+        with cls._instances_lock:
+            key = path.absolute()
+            if (instance := cls._instances.get(key)) is None:
+                instance = cls._instances[key] = cls(path)
+            return instance
+
+    @property
+    def data(self) -> ChecksumCacheData:
+        """The cache contents, read from disk on first access."""
+        with self._lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def get(self, file_path: Path, algorithm: str) -> str | None:
+        """Get the cached checksum of a file unless the file changed since."""
+        entry = self.data.entries.get(self._key(file_path))
+        if entry is None or algorithm not in entry.checksums:
+            return None
+
+        try:
+            stat_result = file_path.stat()
+        except OSError:
+            return None
+
+        return entry.checksums[algorithm] if entry.matches(stat_result) else None
+
+    def put(
+        self,
+        file_path: Path,
+        stat_result: os.stat_result,
+        algorithm: str,
+        checksum: str,
+    ) -> None:
+        """Store the checksum of a file as of the given stat data."""
+        key = self._key(file_path)
+        with self._lock:
+            entry = self.data.entries.get(key)
+            if entry is None or not entry.matches(stat_result):
+                entry = ChecksumCacheEntry.from_stat(stat_result)
+                self.data.entries[key] = entry
+
+            entry.checksums[algorithm] = checksum
+            self._is_dirty = True
+
+    def get_checksums(
+        self,
+        file_path: Path,
+        algorithms: list[HashAlgorithm],
+        hasher: FileHasher,
+        verify: bool = False,
+    ) -> dict[HashAlgorithm, str]:
+        """Get checksums of a file, reusing cached ones if the file is unchanged.
+
+        All checksums missing from the cache are computed in one read pass.
+        """
+        checksums: dict[HashAlgorithm, str] = {}
+        if not verify:
+            for algorithm in algorithms:
+                checksum = self.get(file_path, algorithm)
+                if checksum is not None:
+                    checksums[algorithm] = checksum
+
+        missing = [algorithm for algorithm in algorithms if algorithm not in checksums]
+        if missing:
+            stat_result = file_path.stat()
+            for algorithm, checksum in hasher.hash_file(file_path, missing).items():
+                self.put(file_path, stat_result, algorithm, checksum)
+                checksums[algorithm] = checksum
+
+        return {algorithm: checksums[algorithm] for algorithm in algorithms}
+
+    def invalidate(self, file_paths: set[Path]) -> None:
+        """Remove the entries of the given files."""
+        with self._lock:
+            for file_path in file_paths:
+                if self.data.entries.pop(self._key(file_path), None) is not None:
+                    self._is_dirty = True
+
+    def evict_missing(self) -> int:
+        """Remove the entries of files that no longer exist."""
+        with self._lock:
+            missing = [key for key in self.data.entries if not os.path.exists(key)]
+            for key in missing:
+                del self.data.entries[key]
+
+            if missing:
+                self._is_dirty = True
+            return len(missing)
+
+    def save(self) -> None:
+        """Write the cache to disk if it changed."""
+        with self._lock:
+            if not self._is_dirty:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_text(self.data.to_json())
+            os.replace(tmp_path, self.path)
+            self._is_dirty = False
+
+    def _read(self) -> ChecksumCacheData:
+        try:
+            data = ChecksumCacheData.from_json(self.path.read_text())
+        except (OSError, ValueError):
+            return ChecksumCacheData()
+
+        return data if isinstance(data, ChecksumCacheData) else ChecksumCacheData()
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        return str(file_path.absolute())
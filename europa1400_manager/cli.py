@@ -1,11 +1,100 @@
+import asyncio
+import importlib
+import inspect
+import json
+import shlex
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Type, cast
+
+import click
+import typer
+from typer.core import TyperGroup
+
 from europa1400_manager.async_typer import AsyncTyper
+from europa1400_manager.batch import BatchRunner
 from europa1400_manager.config import Config
+from europa1400_manager.daemon import DaemonServer
 from europa1400_manager.database import Database
 from europa1400_manager.modules.base_module import BaseModule
-from europa1400_manager.modules.config_module import ConfigModule
-from europa1400_manager.modules.info_module import InfoModule
-from europa1400_manager.modules.license_module import LicenseModule
-from europa1400_manager.modules.patch_module import PatchModule
+from europa1400_manager.profiler import Profiler
+from europa1400_manager.streams import install_context_streams
+from europa1400_manager.utils import EnvUtils
+
+
+@dataclass(frozen=True)
+class ModuleDescriptor:
+    """Describes a module without importing or constructing it."""
+
+    name: str
+    help: str
+    import_path: str
+    class_name: str
+
+    def load(self) -> Type[BaseModule]:
+        """Import the module class."""
+        module = importlib.import_module(self.import_path)
+        return cast(Type[BaseModule], getattr(module, self.class_name))
+
+
+MODULE_DESCRIPTORS: list[ModuleDescriptor] = [
+    ModuleDescriptor(
+        "config",
+        "Configuration module",
+        "europa1400_manager.modules.config_module",
+        "ConfigModule",
+    ),
+    ModuleDescriptor(
+        "info",
+        "Information module",
+        "europa1400_manager.modules.info_module",
+        "InfoModule",
+    ),
+    ModuleDescriptor(
+        "patch",
+        "Patches module",
+        "europa1400_manager.modules.patch_module",
+        "PatchModule",
+    ),
+    ModuleDescriptor(
+        "license",
+        "License module",
+        "europa1400_manager.modules.license_module",
+        "LicenseModule",
+    ),
+    ModuleDescriptor(
+        "cache",
+        "Cache module",
+        "europa1400_manager.modules.cache_module",
+        "CacheModule",
+    ),
+]
+
+
+class LazyModuleGroup(TyperGroup):
+    """A command group whose module subcommands are built on first lookup."""
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        super().__init__(*args, **kwargs)  # type: ignore[arg-type]
+        self.lazy_commands: dict[str, Callable[[], click.Command]] = {}
+
+    def add_lazy_command(self, name: str, load: Callable[[], click.Command]) -> None:
+        self.lazy_commands[name] = load
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return super().list_commands(ctx) + [
+            name for name in self.lazy_commands if name not in self.commands
+        ]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        load = self.lazy_commands.pop(cmd_name, None)
+        if load is not None:
+            self.add_command(load(), cmd_name)
+        return super().get_command(ctx, cmd_name)
 
 
 class Cli:
@@ -13,25 +102,121 @@ class Cli:
         self.config = config
         self.database = database
 
-        config_module = ConfigModule(config, database)
-        info_module = InfoModule(config, database)
-        patch_module = PatchModule(config, database)
-        license_module = LicenseModule(config, database)
+        self.descriptors = MODULE_DESCRIPTORS
+        self.modules: dict[str, BaseModule] = {}
+        self.executor = ThreadPoolExecutor(thread_name_prefix="europa1400-manager")
 
-        self.modules: list[BaseModule] = [
-            config_module,
-            info_module,
-            patch_module,
-            license_module,
-        ]
-        self.typer_app = AsyncTyper(no_args_is_help=True)
+        self.typer_app = AsyncTyper(no_args_is_help=True, cls=LazyModuleGroup)
         self.typer_app.callback()(self.default)
+        self.typer_app.command()(self.serve)
+        self.typer_app.command()(self.batch)
+
+        self.command = cast(LazyModuleGroup, typer.main.get_command(self.typer_app))
+        for descriptor in self.descriptors:
+            self.command.add_lazy_command(
+                descriptor.name, partial(self._load, descriptor)
+            )
 
-        for module in self.modules:
-            self.typer_app.add_typer(module.typer_app, name=module.NAME)
+    async def run(self, args: list[str] | None = None) -> int:
+        """Dispatch a command line on the running loop and return its exit code."""
+        asyncio.get_running_loop().set_default_executor(self.executor)
 
-    async def run(self) -> None:
-        self.typer_app()
+        try:
+            with Profiler.span(
+                f"command {shlex.join(sys.argv[1:] if args is None else args)}"
+            ):
+                result = self.command.main(args, standalone_mode=False)
+                if inspect.isawaitable(result):
+                    await result
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except (click.Abort, EOFError):
+            click.echo("Aborted!", err=True)
+            return 1
+        return 0
+
+    def get_module(self, descriptor: ModuleDescriptor) -> BaseModule:
+        """Get the module of a descriptor, constructing it on first use."""
+        module = self.modules.get(descriptor.name)
+        if module is None:
+            with Profiler.span(f"construct {descriptor.name} module"):
+                module = descriptor.load()(self.config, self.database)
+            self.modules[descriptor.name] = module
+        return module
+
+    def _load(self, descriptor: ModuleDescriptor) -> click.Command:
+        """Build the commands of a module without constructing it."""
+        module_class = descriptor.load()
+        typer_app = module_class.create_typer_app(lambda: self.get_module(descriptor))
+        typer_app.info.help = descriptor.help
+        return typer.main.get_group(typer_app)
 
     def default(self, gui: bool = False) -> None:
         """Launch the GUI."""
+
+    async def serve(
+        self,
+        socket_path: Path | None = typer.Option(
+            None, "--socket", "-s", help="Socket to accept commands on."
+        ),
+    ) -> None:
+        """Keep the manager loaded and run commands sent by later invocations."""
+        if not hasattr(socket, "AF_UNIX"):
+            typer.echo("Serving requires Unix domain socket support.", err=True)
+            raise typer.Exit(1)
+
+        daemon = DaemonServer(self, socket_path or EnvUtils.get_daemon_socket_path())
+        try:
+            await daemon.serve()
+        except RuntimeError as e:
+            typer.echo(str(e), err=True)
+            raise typer.Exit(1)
+
+    async def batch(
+        self,
+        file: Path | None = typer.Argument(
+            None, help="Commands, one per line or as a JSON list. Defaults to stdin."
+        ),
+        concurrency: int = typer.Option(
+            1, "--concurrency", "-c", help="Maximum number of commands run at once."
+        ),
+        json_output: bool = typer.Option(
+            False, "--json", help="Print one JSON result per command."
+        ),
+    ) -> None:
+        """Run several commands in one process, sharing the loaded database."""
+        if file is not None:
+            text = file.read_text()
+        else:
+            # Reading may wait for a daemon client, so keep the loop free
+            text = await asyncio.to_thread(sys.stdin.read)
+        try:
+            commands = BatchRunner.parse(text)
+        except ValueError as e:
+            raise typer.BadParameter(str(e), param_hint="FILE")
+
+        if not commands and file is None and not sys.stdin.isatty():
+            typer.echo("No commands were read from stdin.", err=True)
+            raise typer.Exit(1)
+
+        failed = 0
+        with install_context_streams():
+            async for result in BatchRunner(self, concurrency).run(commands):
+                failed += result.exit_code != 0
+                if json_output:
+                    typer.echo(json.dumps(result.to_dict()))
+                    continue
+
+                typer.echo(
+                    f"==> {shlex.join(result.args)} "
+                    f"(exit code {result.exit_code}, {result.elapsed:.2f} s)"
+                )
+                typer.echo(result.stdout, nl=False)
+                typer.echo(result.stderr, nl=False, err=True)
+
+        if failed:
+            typer.echo(f"{failed} of {len(commands)} commands failed.", err=True)
+            raise typer.Exit(1)
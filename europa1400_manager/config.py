@@ -1,8 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any
 
-import yaml
 from dataclass_wizard import JSONWizard, YAMLWizard, json_field
 
 from europa1400_manager.const import (
@@ -33,6 +32,13 @@ class Config(YAMLWizard, JSONWizard):
         with self.config_file_path.open("w") as config_file:
             config_file.write(self.to_yaml())
 
+    def reload(self) -> None:
+        """Read the configuration file again into this instance."""
+        config = Config.load(self.app_mode)
+        for config_field in fields(self):
+            if config_field.init:
+                setattr(self, config_field.name, getattr(config, config_field.name))
+
     def reset(self) -> None:
         """Reset the configuration to default values."""
 
@@ -76,6 +82,8 @@ class Config(YAMLWizard, JSONWizard):
             else:
                 exit(1)
 
+        import yaml
+
         with config_file_path.open("r") as config_file:
             config_dict: dict[str, Any] = yaml.safe_load(config_file)
             config_dict["app_mode"] = app_mode
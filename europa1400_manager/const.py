@@ -4,12 +4,45 @@ ENV_CONFIG_FILE_PATH = "CONFIG_FILE_PATH"
 ENV_DATABASE_REPOSITORY_URL = "DATABASE_REPOSITORY_URL"
 ENV_DATABASE_REPOSITORY_BRANCH = "DATABASE_REPOSITORY_BRANCH"
 ENV_DATABASE_FILES_BASE_PATH = "DATABASE_FILES_BASE_PATH"
+ENV_DATABASE_FETCH_CONCURRENCY = "DATABASE_FETCH_CONCURRENCY"
+ENV_DATABASE_FETCH_TIMEOUT = "DATABASE_FETCH_TIMEOUT"
+ENV_DATABASE_CACHE_PATH = "DATABASE_CACHE_PATH"
+ENV_DATABASE_CACHE_MAX_AGE = "DATABASE_CACHE_MAX_AGE"
+ENV_DATABASE_TRANSPORT = "DATABASE_TRANSPORT"
+ENV_DATABASE_ARCHIVE_URL = "DATABASE_ARCHIVE_URL"
+ENV_DETECTION_POLICY = "DETECTION_POLICY"
+ENV_DAEMON_SOCKET_PATH = "DAEMON_SOCKET_PATH"
+
+# Commands are only forwarded to a daemon running with the same values
+DAEMON_ENVIRONMENT = [
+    ENV_CONFIG_FILE_PATH,
+    ENV_DATABASE_REPOSITORY_URL,
+    ENV_DATABASE_REPOSITORY_BRANCH,
+    ENV_DATABASE_FILES_BASE_PATH,
+    ENV_DATABASE_FETCH_CONCURRENCY,
+    ENV_DATABASE_FETCH_TIMEOUT,
+    ENV_DATABASE_CACHE_PATH,
+    ENV_DATABASE_CACHE_MAX_AGE,
+    ENV_DATABASE_TRANSPORT,
+    ENV_DATABASE_ARCHIVE_URL,
+    ENV_DETECTION_POLICY,
+]
 
 
 DEFAULT_CONFIG_FILE_PATH = "config.yml"
 DEFAULT_DATABASE_REPOSITORY_URL = "https://raw.githubusercontent.com/europa1400-community/europa1400-database/refs/heads/"
 DEFAULT_DATABASE_REPOSITORY_BRANCH = "master"
 DEFAULT_DATABASE_FILES_BASE_PATH = "data"
+DEFAULT_DATABASE_FETCH_CONCURRENCY = "8"
+DEFAULT_DATABASE_FETCH_TIMEOUT = "10"
+DEFAULT_DATABASE_CACHE_PATH = "cache"
+DEFAULT_DATABASE_CACHE_MAX_AGE = "0"
+DEFAULT_DATABASE_TRANSPORT = "files"
+DEFAULT_DATABASE_ARCHIVE_URL = (
+    "https://github.com/europa1400-community/europa1400-database/archive/refs/heads/"
+)
+DEFAULT_DETECTION_POLICY = "interactive"
+DEFAULT_DAEMON_SOCKET_PATH = "europa1400-manager.sock"
 
 
 class AppMode(StrEnum):
@@ -17,8 +50,28 @@ class AppMode(StrEnum):
     GUI = "gui"
 
 
+class DatabaseTransport(StrEnum):
+    FILES = "files"
+    ARCHIVE = "archive"
+
+
+class ResolutionPolicy(StrEnum):
+    INTERACTIVE = "interactive"
+    FIRST_WINS = "first-wins"
+    MOST_SPECIFIC = "most-specific"
+    HASH_CONFIRMED = "hash-confirmed"
+
+
+class HashAlgorithm(StrEnum):
+    MD5 = "md5"
+    SHA1 = "sha1"
+    SHA256 = "sha256"
+    CRC32 = "crc32"
+
+
 class PatchType(StrEnum):
     DDRAWCOMPAT = "ddrawcompat"
 
 
 EVENT_UPDATE_ALL_MODULES = "update_all_modules"
+EVENT_GAME_METADATA_DETECTED = "game_metadata_detected"
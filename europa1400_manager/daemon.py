@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import threading
+import traceback
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, TextIO, cast
+
+from europa1400_manager.daemon_client import DaemonClient
+from europa1400_manager.streams import install_context_streams, set_context_streams
+from europa1400_manager.utils import EnvUtils
+
+if TYPE_CHECKING:
+    from europa1400_manager.cli import Cli
+
+
+class RequestConnection:
+    """Blocking connection to the client of one request.
+
+    Output and input requests may come from the event loop and from worker
+    threads alike. Once the client is gone, output is discarded and input
+    reads as end of file.
+    """
+
+    def __init__(self, connection: socket.socket) -> None:
+        self.connection = connection
+        self.is_closed = False
+        self._reader: BinaryIO = connection.makefile("rb")
+        self._send_lock = threading.Lock()
+        self._receive_lock = threading.Lock()
+
+    def send(self, message: dict[str, Any]) -> None:
+        data = (json.dumps(message) + "\n").encode()
+        with self._send_lock:
+            if self.is_closed:
+                return
+            try:
+                self.connection.sendall(data)
+            except OSError:
+                self.is_closed = True
+
+    def request(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        """Send a message and wait for the client's reply."""
+        with self._receive_lock:
+            self.send(message)
+            if self.is_closed:
+                return None
+            try:
+                line = self._reader.readline()
+            except OSError:
+                line = b""
+            if not line:
+                self.is_closed = True
+                return None
+            return cast(dict[str, Any], json.loads(line))
+
+    def close(self) -> None:
+        self._reader.close()
+        self.connection.close()
+
+
+class RequestOutput:
+    """Output stream of a daemon request, sent to the client as JSON lines."""
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, name: str, connection: RequestConnection) -> None:
+        self.name = name
+        self.connection = connection
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        if text:
+            self.connection.send({"stream": self.name, "data": text})
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        raise io.UnsupportedOperation("fileno")
+
+
+class RequestInput:
+    """Input stream of a daemon request, read from the client on demand."""
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, connection: RequestConnection, is_tty: bool) -> None:
+        self.connection = connection
+        self.is_tty = is_tty
+
+    def read(self, size: int = -1) -> str:
+        return self._read({"read": size})
+
+    def readline(self, size: int = -1) -> str:
+        return self._read({"readline": size})
+
+    def _read(self, message: dict[str, Any]) -> str:
+        reply = self.connection.request(message)
+        return "" if reply is None else str(reply["data"])
+
+    def write(self, text: str) -> int:
+        raise io.UnsupportedOperation("write")
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return self.is_tty
+
+    def fileno(self) -> int:
+        raise io.UnsupportedOperation("fileno")
+
+
+class DaemonServer:
+    """Runs CLI commands sent by clients over a Unix domain socket.
+
+    The configuration, the database and the constructed modules of one
+    :class:`Cli` stay alive between commands. The configuration is read again
+    before a request whenever its file changed. A request is one JSON line with
+    the arguments, the working directory and the environment of the client,
+    which must match those of the daemon. Standard output and error are
+    streamed back as JSON lines, followed by a line with the exit code. Reads
+    from standard input are forwarded to the client, which replies with what
+    it read, so prompts and piped input work as in a local run. Commands read
+    input from worker threads, so one waiting for its client does not hold up
+    other requests.
+    """
+
+    REQUEST_LIMIT = 1024 * 1024
+
+    def __init__(self, cli: Cli, socket_path: Path) -> None:
+        self.cli = cli
+        self.socket_path = socket_path
+        self._requests: set[asyncio.Task[None]] = set()
+        self._config_state = self._get_config_state()
+
+    async def serve(self) -> None:
+        """Serve requests until cancelled or terminated."""
+        if self.socket_path.exists():
+            if DaemonClient(self.socket_path).is_alive():
+                raise RuntimeError(
+                    f"A daemon is already serving on {self.socket_path}."
+                )
+            self.socket_path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signal.SIGTERM, stop.set)
+
+        try:
+            server.bind(str(self.socket_path))
+            server.listen()
+            server.setblocking(False)
+
+            with install_context_streams():
+                accepting = asyncio.create_task(self._accept(server))
+                print(f"Serving commands on {self.socket_path}.")
+                try:
+                    await stop.wait()
+                finally:
+                    accepting.cancel()
+                    await asyncio.gather(
+                        accepting, *self._requests, return_exceptions=True
+                    )
+        finally:
+            with contextlib.suppress(NotImplementedError):
+                loop.remove_signal_handler(signal.SIGTERM)
+            server.close()
+            self.socket_path.unlink(missing_ok=True)
+
+    async def _accept(self, server: socket.socket) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            connection, _ = await loop.sock_accept(server)
+            task = asyncio.create_task(self._handle(connection))
+            self._requests.add(task)
+            task.add_done_callback(self._requests.discard)
+
+    async def _handle(self, connection: socket.socket) -> None:
+        try:
+            data = await self._read_request(connection)
+        except OSError:
+            connection.close()
+            return
+
+        # Requests may read input while the command runs, possibly from worker
+        # threads, so the connection is used blocking from here on.
+        connection.setblocking(True)
+        client = RequestConnection(connection)
+        try:
+            request = json.loads(data)
+            args = [str(arg) for arg in request["args"]]
+            cwd = str(request["cwd"])
+            environment = dict(request.get("env", {}))
+            is_tty = bool(request.get("isatty", False))
+        except (ValueError, KeyError, TypeError):
+            client.send({"rejected": "Malformed request."})
+        else:
+            differing = sorted(
+                name
+                for name, value in EnvUtils.get_daemon_environment().items()
+                if environment.get(name) != value
+            )
+            if args[:1] == ["serve"]:
+                client.send({"rejected": "The daemon cannot serve itself."})
+            elif cwd != os.getcwd():
+                client.send({"rejected": f"The daemon runs in {os.getcwd()}."})
+            elif differing:
+                client.send(
+                    {"rejected": f"The daemon runs with other {', '.join(differing)}."}
+                )
+            elif (reason := self._reload_config()) is not None:
+                client.send({"rejected": reason})
+            else:
+                set_context_streams(
+                    cast(TextIO, RequestInput(client, is_tty)),
+                    cast(TextIO, RequestOutput("stdout", client)),
+                    cast(TextIO, RequestOutput("stderr", client)),
+                )
+                try:
+                    exit_code = await self.cli.run(args)
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+                client.send({"exit_code": exit_code})
+        finally:
+            client.close()
+
+    def _reload_config(self) -> str | None:
+        """Read the configuration again if its file changed since it was read.
+
+        Returns why the request cannot be served if the file cannot be read.
+        """
+        state = self._get_config_state()
+        if state == self._config_state:
+            return None
+
+        config_file_path = self.cli.config.config_file_path
+        if state is None:
+            return f"The configuration file {config_file_path} is missing."
+        try:
+            self.cli.config.reload()
+        except Exception as e:
+            return f"Cannot read the configuration file {config_file_path}: {e}"
+        self._config_state = state
+        return None
+
+    def _get_config_state(self) -> tuple[int, int] | None:
+        """Get the modification time and size of the configuration file."""
+        try:
+            stat_result = self.cli.config.config_file_path.stat()
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    async def _read_request(self, connection: socket.socket) -> bytes:
+        """Read the request line without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        data = b""
+        while not data.endswith(b"\n") and len(data) < self.REQUEST_LIMIT:
+            chunk = await loop.sock_recv(connection, 64 * 1024)
+            if not chunk:
+                break
+            data += chunk
+        return data
@@ -0,0 +1,88 @@
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+
+class DaemonClient:
+    """Forwards a command line to a running daemon and replays its output.
+
+    Standard input is only read when the daemon asks for it.
+    """
+
+    def __init__(self, socket_path: Path) -> None:
+        self.socket_path = socket_path
+
+    def is_alive(self) -> bool:
+        """Check whether a daemon accepts connections on the socket."""
+        connection = self._connect()
+        if connection is None:
+            return False
+        connection.close()
+        return True
+
+    def run(
+        self, args: list[str], environment: dict[str, str | None] | None = None
+    ) -> int | None:
+        """Run a command on the daemon.
+
+        Returns the exit code, or ``None`` if no daemon is reachable or it
+        rejected the request, in which case the command should run locally.
+        The daemon rejects requests whose ``environment`` differs from its own.
+        """
+        connection = self._connect()
+        if connection is None:
+            return None
+
+        with connection, connection.makefile("rwb") as stream:
+            request = {
+                "args": args,
+                "cwd": os.getcwd(),
+                "env": environment or {},
+                "isatty": sys.stdin is not None and sys.stdin.isatty(),
+            }
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+
+            for line in stream:
+                message = json.loads(line)
+                if "rejected" in message:
+                    return None
+                if "exit_code" in message:
+                    return int(message["exit_code"])
+                if "read" in message or "readline" in message:
+                    reply = {"data": self._read_input(message)}
+                    stream.write(json.dumps(reply).encode() + b"\n")
+                    stream.flush()
+                    continue
+
+                output = sys.stderr if message["stream"] == "stderr" else sys.stdout
+                output.write(message["data"])
+                output.flush()
+
+        print(
+            "Warning: The daemon closed the connection unexpectedly.", file=sys.stderr
+        )
+        return 1
+
+    @staticmethod
+    def _read_input(message: dict[str, int]) -> str:
+        """Read from standard input as the daemon asked."""
+        if sys.stdin is None:
+            return ""
+        if "readline" in message:
+            return sys.stdin.readline(message["readline"])
+        return sys.stdin.read(message["read"])
+
+    def _connect(self) -> socket.socket | None:
+        if not hasattr(socket, "AF_UNIX") or not self.socket_path.exists():
+            return None
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(str(self.socket_path))
+        except OSError:
+            connection.close()
+            return None
+        return connection
@@ -1,97 +1,347 @@
 from __future__ import annotations
 
-from typing import Type, TypeVar, cast
+import asyncio
+import hashlib
+import sys
+import time
+from typing import Iterable, Type, TypeVar, cast
 
+from europa1400_manager.cache import DatabaseCache
+from europa1400_manager.const import DatabaseTransport
+from europa1400_manager.detection import DetectionIndex
 from europa1400_manager.models import (
     DatabaseElement,
     DatabaseTable,
     GameDistributionTable,
     GameDrmTable,
     GameEditionTable,
+    GameExecutableHashTable,
     GameExecutableTable,
     GameExecutableToMetadataTable,
     GameLanguageTable,
+    GameMetadataToPatchTable,
+    GamePatchTable,
     GameVersionTable,
 )
-from europa1400_manager.utils import DatabaseUtils
+from europa1400_manager.patch_index import PatchIndex
+from europa1400_manager.profiler import Profiler
+from europa1400_manager.snapshot import DatabaseSnapshot
+from europa1400_manager.sources.base_source import BaseDatabaseSource
+from europa1400_manager.utils import DatabaseUtils, EnvUtils
 
 TTable = TypeVar("TTable", bound=DatabaseTable)
 TElement = TypeVar("TElement", bound=DatabaseElement)
 
 
 class Database:
-    """Database class that initializes once and provides access to table elements."""
+    """Database class that loads tables on first use and provides access to their elements."""
+
+    TABLE_TYPES: list[Type[DatabaseTable]] = [
+        GameLanguageTable,
+        GameEditionTable,
+        GameVersionTable,
+        GameDistributionTable,
+        GameDrmTable,
+        GameExecutableTable,
+        GameExecutableToMetadataTable,
+        GameExecutableHashTable,
+        GamePatchTable,
+        GameMetadataToPatchTable,
+    ]
+
+    SNAPSHOT_FILE_NAME = "database.snapshot"
+    # Seconds after which a table that failed to fetch is fetched again
+    FALLBACK_RETRY_DELAY = 10.0
 
     def __init__(self) -> None:
         self._tables: dict[Type[DatabaseTable], DatabaseTable] = {}
-        self._initialized = False
+        self._indexes: dict[Type[DatabaseTable], dict[str, DatabaseElement]] = {}
+        self._loading: dict[Type[DatabaseTable], asyncio.Task[None]] = {}
+        self._content_hashes: dict[Type[DatabaseTable], str] = {}
+        self._fallbacks: dict[Type[DatabaseTable], float] = {}
+        self._source: BaseDatabaseSource | None = None
+        self._source_users = 0
+        self._semaphore = asyncio.Semaphore()
+        self._detection_index: DetectionIndex | None = None
+        self._patch_index: PatchIndex | None = None
+        self.cache = DatabaseCache(
+            EnvUtils.get_database_cache_path(), EnvUtils.get_database_cache_max_age()
+        )
+        self.snapshot = DatabaseSnapshot(self.cache.path / self.SNAPSHOT_FILE_NAME)
 
     async def init(self) -> None:
-        """Initialize the database by fetching all tables once."""
-        if self._initialized:
-            return
-
-        # List of all table types to fetch
-        table_types: list[Type[DatabaseTable]] = [
-            GameLanguageTable,
-            GameEditionTable,
-            GameVersionTable,
-            GameDistributionTable,
-            GameDrmTable,
-            GameExecutableTable,
-            GameExecutableToMetadataTable,
+        """Initialize the database by loading all tables."""
+        await self.load(*self.TABLE_TYPES)
+
+    async def load(self, *table_types: Type[DatabaseTable]) -> None:
+        """Load the given tables unless they are already loaded.
+
+        Tables are fetched concurrently, and callers asking for a table that
+        is still being fetched wait for that fetch instead of starting another.
+        Tables that fell back to an empty table are fetched again once
+        ``FALLBACK_RETRY_DELAY`` has passed.
+        """
+        tasks = [
+            self._get_load_task(table_type)
+            for table_type in table_types
+            if self._needs_load(table_type)
         ]
+        if tasks:
+            await asyncio.shield(asyncio.gather(*tasks))
 
-        # Fetch all tables
-        for table_type in table_types:
-            try:
-                table: DatabaseTable = await DatabaseUtils.fetch_table(table_type)
-                self._tables[table_type] = table
-            except Exception as e:
-                print(f"Warning: Failed to fetch {table_type.__name__}: {e}")
-                self._tables[table_type] = table_type(id="", name="", elements=[])
+    async def get_detection_index(self) -> DetectionIndex:
+        """Get the detection index, building it once its tables are loaded."""
+        await self.load(*DetectionIndex.TABLES)
+
+        if self._detection_index is None:
+            self._detection_index = DetectionIndex.build(self)
+        return self._detection_index
+
+    async def get_patch_index(self) -> PatchIndex:
+        """Get the patch index, building it once its tables are loaded."""
+        await self.load(*PatchIndex.TABLES)
+
+        if self._patch_index is None:
+            self._patch_index = PatchIndex.build(self)
+        return self._patch_index
+
+    def _needs_load(self, table_type: Type[DatabaseTable]) -> bool:
+        """Check whether a table is missing or due for another fetch attempt."""
+        if table_type not in self._tables:
+            return True
+
+        failed_at = self._fallbacks.get(table_type)
+        return (
+            failed_at is not None
+            and time.monotonic() - failed_at >= self.FALLBACK_RETRY_DELAY
+        )
+
+    def _get_load_task(self, table_type: Type[DatabaseTable]) -> asyncio.Task[None]:
+        """Return the running fetch of a table, starting one if necessary."""
+        if (task := self._loading.get(table_type)) is not None:
+            return task
+
+        if self._source_users == 0:
+            concurrency = EnvUtils.get_database_fetch_concurrency()
+            self._source = self.create_source(concurrency)
+            self._semaphore = asyncio.Semaphore(concurrency)
+        self._source_users += 1
+
+        task = asyncio.create_task(self._load_table(table_type))
+        self._loading[table_type] = task
+        return task
+
+    async def _load_table(self, table_type: Type[DatabaseTable]) -> None:
+        """Fetch a table, falling back to an empty table if that fails.
+
+        Optional tables that do not exist are empty without a warning.
+        """
+        timeout = EnvUtils.get_database_fetch_timeout()
+        table: DatabaseTable = table_type(id="", name="", elements=[])
+        is_fallback = True
+
+        try:
+            async with self._semaphore:
+                if self._source is None:
+                    raise RuntimeError("Database source is not open.")
+                async with asyncio.timeout(
+                    None if self._source.HANDLES_TIMEOUT else timeout
+                ):
+                    with Profiler.span(f"fetch {table_type.FILE_NAME}"):
+                        data = await self._source.read_file(table_type.FILE_NAME)
+            with Profiler.span(f"parse {table_type.FILE_NAME}"):
+                table = self._parse_table(table_type, data)
+            is_fallback = False
+        except TimeoutError:
+            print(
+                f"Warning: Failed to fetch {table_type.__name__}: "
+                f"timed out after {timeout} seconds",
+                file=sys.stderr,
+            )
+        except FileNotFoundError as e:
+            is_fallback = not table_type.IS_OPTIONAL
+            if is_fallback:
+                print(
+                    f"Warning: Failed to fetch {table_type.__name__}: {e}",
+                    file=sys.stderr,
+                )
+        except Exception as e:
+            print(
+                f"Warning: Failed to fetch {table_type.__name__}: {e}", file=sys.stderr
+            )
+        finally:
+            if is_fallback:
+                self._fallbacks[table_type] = time.monotonic()
+            else:
+                self._fallbacks.pop(table_type, None)
+            self._add_table(table_type, table)
+            del self._loading[table_type]
+            await self._release_source()
+
+    def _parse_table(
+        self, table_type: Type[DatabaseTable], data: bytes
+    ) -> DatabaseTable:
+        """Parse a table, reusing the compiled snapshot if its source is unchanged."""
+        content_hash = DatabaseSnapshot.hash_content(data)
+        self._content_hashes[table_type] = content_hash
+
+        if (table := self.snapshot.get(table_type, content_hash)) is not None:
+            return table
+
+        table = DatabaseUtils.parse_table(table_type, data)
+        self.snapshot.put(table_type, content_hash, table)
+        return table
+
+    async def _release_source(self) -> None:
+        """Close the shared source once no fetch uses it anymore."""
+        self._source_users -= 1
+        if self._source_users == 0 and self._source is not None:
+            source, self._source = self._source, None
+            await source.close()
+            self.snapshot.save()
+
+    def _add_table(self, table_type: Type[DatabaseTable], table: DatabaseTable) -> None:
+        """Store a table and index its elements by ID.
+
+        Replacing a table drops the indexes built from the previous one.
+        """
+        if table_type in self._tables:
+            self._detection_index = None
+            self._patch_index = None
+
+        index: dict[str, DatabaseElement] = {}
+        for element in table.elements:
+            if element.id in index:
+                print(
+                    f"Warning: Duplicate ID {element.id} in table "
+                    f"{table_type.__name__}, keeping the first occurrence.",
+                    file=sys.stderr,
+                )
+                continue
+            index[element.id] = element
+
+        self._tables[table_type] = table
+        self._indexes[table_type] = index
+
+    def _get_index(self, table_type: Type[DatabaseTable]) -> dict[str, DatabaseElement]:
+        """Get the element index of a loaded table."""
+        if table_type not in self._indexes:
+            raise RuntimeError(
+                f"Table {table_type.__name__} not loaded. Call load() first."
+            )
+        return self._indexes[table_type]
+
+    def create_source(self, concurrency: int | None = None) -> BaseDatabaseSource:
+        """Create the source configured by ``DATABASE_REPOSITORY_URL``.
+
+        Sources are imported here, so the HTTP client is only loaded when the
+        database is fetched over HTTP.
+        """
+        files_base_path = EnvUtils.get_database_files_base_path()
+        repository_path = EnvUtils.get_database_repository_path()
+
+        if (
+            repository_path is None
+            and EnvUtils.get_database_transport() is DatabaseTransport.ARCHIVE
+        ):
+            from europa1400_manager.sources.http_archive_source import (
+                HttpArchiveDatabaseSource,
+            )
+
+            return HttpArchiveDatabaseSource(
+                EnvUtils.get_database_archive_url(),
+                files_base_path,
+                self.cache,
+                concurrency,
+                EnvUtils.get_database_fetch_timeout(),
+            )
+
+        if repository_path is None:
+            from europa1400_manager.sources.http_source import HttpDatabaseSource
+
+            return HttpDatabaseSource(
+                EnvUtils.get_database_repository_url()
+                / EnvUtils.get_database_repository_branch()
+                / files_base_path,
+                self.cache,
+                concurrency,
+            )
+
+        if repository_path.is_file():
+            from europa1400_manager.sources.archive_source import (
+                ArchiveDatabaseSource,
+            )
+
+            return ArchiveDatabaseSource(repository_path, files_base_path)
 
-        self._initialized = True
+        from europa1400_manager.sources.directory_source import (
+            DirectoryDatabaseSource,
+        )
+
+        return DirectoryDatabaseSource(repository_path, files_base_path)
 
     def get_table_elements(
         self, table_type: Type[TTable], element_type: Type[TElement]
     ) -> list[TElement]:
         """Get all elements of a specific type from a table."""
-        if not self._initialized:
-            raise RuntimeError("Database not initialized. Call init() first.")
-
-        table = self._tables.get(table_type)
-        if table is None:
-            return []
-
-        return cast(list[TElement], table.elements)
+        return cast(list[TElement], self.get_table(table_type).elements)
 
     def get_table_element(
         self, element_id: str, table_type: Type[TTable], element_type: Type[TElement]
     ) -> TElement:
         """Get a specific element by ID from a table."""
-        if not self._initialized:
-            raise RuntimeError("Database not initialized. Call init() first.")
-
-        elements = self.get_table_elements(table_type, element_type)
-        if not (
-            element := next(
-                (element for element in elements if element.id == element_id), None
-            )
-        ):
+        element = self._get_index(table_type).get(element_id)
+        if element is None:
             raise ValueError(
                 f"Element with ID {element_id} not found in table {table_type.__name__}."
             )
-        return element
+        return cast(TElement, element)
+
+    def has_table_element(self, element_id: str, table_type: Type[TTable]) -> bool:
+        """Check if a table contains an element with the given ID."""
+        return element_id in self._get_index(table_type)
+
+    def get_table_elements_by_ids(
+        self,
+        element_ids: Iterable[str],
+        table_type: Type[TTable],
+        element_type: Type[TElement],
+    ) -> list[TElement]:
+        """Get several elements by ID from a table, in the order of the IDs."""
+        index = self._get_index(table_type)
+        elements: list[TElement] = []
+        for element_id in element_ids:
+            element = index.get(element_id)
+            if element is None:
+                raise ValueError(
+                    f"Element with ID {element_id} not found in table {table_type.__name__}."
+                )
+            elements.append(cast(TElement, element))
+        return elements
 
     def get_table(self, table_type: Type[TTable]) -> TTable:
         """Get a specific table by type."""
-        if not self._initialized:
-            raise RuntimeError("Database not initialized. Call init() first.")
+        if table_type not in self._tables:
+            raise RuntimeError(
+                f"Table {table_type.__name__} not loaded. Call load() first."
+            )
 
         return cast(TTable, self._tables[table_type])
 
+    def get_content_hash(self, *table_types: Type[DatabaseTable]) -> str:
+        """Get a hash over the source files of the given loaded tables."""
+        digest = hashlib.sha256()
+        for table_type in table_types:
+            self.get_table(table_type)
+            content_hash = self._content_hashes.get(table_type, "")
+            digest.update(f"{table_type.FILE_NAME}:{content_hash}\n".encode())
+        return digest.hexdigest()
+
+    def is_loaded(self, table_type: Type[DatabaseTable]) -> bool:
+        """Check if a table has been loaded."""
+        return table_type in self._tables
+
     @property
     def is_initialized(self) -> bool:
-        """Check if the database has been initialized."""
-        return self._initialized
+        """Check if all tables have been loaded."""
+        return all(table_type in self._tables for table_type in self.TABLE_TYPES)
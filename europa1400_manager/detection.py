@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from dataclasses import dataclass, field, replace
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any
+
+from europa1400_manager.checksum_cache import ChecksumCache
+from europa1400_manager.const import AppMode, HashAlgorithm, ResolutionPolicy
+from europa1400_manager.detection_memo import DetectionMemo, DetectionMemoEntry
+from europa1400_manager.hashing import FileHasher
+from europa1400_manager.models import (
+    DatabaseTable,
+    GameDistribution,
+    GameDistributionTable,
+    GameDrm,
+    GameDrmTable,
+    GameEdition,
+    GameEditionTable,
+    GameExecutable,
+    GameExecutableHash,
+    GameExecutableHashTable,
+    GameExecutableTable,
+    GameExecutableToMetadata,
+    GameExecutableToMetadataTable,
+    GameLanguage,
+    GameLanguageTable,
+    GameMetadata,
+    GameMetadataId,
+    GameVersion,
+    GameVersionTable,
+)
+from europa1400_manager.profiler import Profiler
+from europa1400_manager.resolution import MetadataResolver
+from europa1400_manager.utils import DialogUtils, EnvUtils, MetadataUtils
+
+if TYPE_CHECKING:
+    from europa1400_manager.config import Config
+    from europa1400_manager.database import Database
+
+
+@dataclass
+class DetectionCandidate:
+    """An executable mapping joined with its executable and resolved metadata."""
+
+    mapping: GameExecutableToMetadata
+    executable: GameExecutable
+    metadata: GameMetadata
+
+    @property
+    def paths(self) -> tuple[str, str]:
+        """The game-relative paths that must exist for this candidate to apply."""
+        return self.executable.path, self.executable.tl_path
+
+
+class DetectionIndex:
+    """Precomputed join of executable mappings used for game detection.
+
+    Foreign keys are resolved and validated once when the index is built, so
+    detecting a game only has to check which candidates' files exist.
+
+    Known executable hashes are indexed by SHA-256, together with the file
+    sizes of the known builds of each executable, so only files with a known
+    size have to be hashed.
+    """
+
+    TABLES: list[type[DatabaseTable]] = [
+        GameLanguageTable,
+        GameEditionTable,
+        GameVersionTable,
+        GameDistributionTable,
+        GameDrmTable,
+        GameExecutableTable,
+        GameExecutableToMetadataTable,
+        GameExecutableHashTable,
+    ]
+
+    def __init__(
+        self,
+        candidates: list[DetectionCandidate],
+        hash_candidates: list[DetectionCandidate] | None = None,
+    ) -> None:
+        self.candidates = candidates
+        self.by_executable: dict[str, list[DetectionCandidate]] = {}
+        for candidate in candidates:
+            self.by_executable.setdefault(candidate.executable.id, []).append(candidate)
+
+        self.by_sha256: dict[str, DetectionCandidate] = {}
+        self.hashed_executables: dict[str, GameExecutable] = {}
+        self.known_sizes: dict[str, set[int]] = {}
+        for candidate in hash_candidates or []:
+            if not isinstance(candidate.mapping, GameExecutableHash):
+                continue
+            self.by_sha256[candidate.mapping.sha256.lower()] = candidate
+            self.hashed_executables[candidate.executable.id] = candidate.executable
+            self.known_sizes.setdefault(candidate.executable.id, set()).add(
+                candidate.mapping.size
+            )
+
+    @classmethod
+    def build(cls, database: Database) -> DetectionIndex:
+        """Join all executable mappings of a database with the tables loaded."""
+        return cls(
+            cls._join(
+                database,
+                database.get_table_elements(
+                    GameExecutableToMetadataTable, GameExecutableToMetadata
+                ),
+            ),
+            cls._join(
+                database,
+                database.get_table_elements(
+                    GameExecutableHashTable, GameExecutableHash
+                ),
+            ),
+        )
+
+    @classmethod
+    def _join(
+        cls,
+        database: Database,
+        mappings: list[GameExecutableToMetadata] | list[GameExecutableHash],
+    ) -> list[DetectionCandidate]:
+        """Resolve the executable and metadata of each mapping."""
+        candidates: list[DetectionCandidate] = []
+        for mapping in mappings:
+            try:
+                candidates.append(
+                    DetectionCandidate(
+                        mapping=mapping,
+                        executable=database.get_table_element(
+                            mapping.executable, GameExecutableTable, GameExecutable
+                        ),
+                        metadata=cls.resolve_metadata(database, mapping.metadata),
+                    )
+                )
+            except ValueError as e:
+                print(
+                    f"Warning: Skipping executable mapping {mapping.id}: {e}",
+                    file=sys.stderr,
+                )
+
+        return candidates
+
+    @staticmethod
+    def resolve_metadata(
+        database: Database, metadata_id: GameMetadataId
+    ) -> GameMetadata:
+        """Resolve the IDs of a :class:`GameMetadataId` to their elements."""
+        game_metadata = GameMetadata()
+        if metadata_id.edition:
+            game_metadata.edition = database.get_table_element(
+                metadata_id.edition, GameEditionTable, GameEdition
+            )
+        if metadata_id.version:
+            game_metadata.version = database.get_table_element(
+                metadata_id.version, GameVersionTable, GameVersion
+            )
+        if metadata_id.distribution:
+            game_metadata.distribution = database.get_table_element(
+                metadata_id.distribution, GameDistributionTable, GameDistribution
+            )
+        if metadata_id.language:
+            game_metadata.language = database.get_table_element(
+                metadata_id.language, GameLanguageTable, GameLanguage
+            )
+        if metadata_id.drm:
+            game_metadata.drm = database.get_table_element(
+                metadata_id.drm, GameDrmTable, GameDrm
+            )
+        return game_metadata
+
+
+@dataclass
+class DetectionResult:
+    """The metadata and executable detected for a game directory."""
+
+    metadata: GameMetadata = field(default_factory=GameMetadata)
+    executable: GameExecutable | None = None
+    trace: list[str] = field(default_factory=list)
+
+
+class GameDetector:
+    """Detects the game metadata of the configured or a given game directory.
+
+    The checksum cache and the memo are saved after every detection unless
+    ``autosave`` is off, in which case the caller saves them once it is done.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        database: Database,
+        checksum_cache: ChecksumCache | None = None,
+        hasher: FileHasher | None = None,
+        game_path: Path | None = None,
+        memo: DetectionMemo | None = None,
+        autosave: bool = True,
+    ) -> None:
+        self.config = config
+        self.database = database
+        self.game_path = game_path or config.game_path
+        self.probed_paths: set[str] = set()
+        self.checksum_cache = checksum_cache or ChecksumCache.open(
+            config.config_file_path.parent / ChecksumCache.FILE_NAME
+        )
+        self.hasher = hasher or FileHasher()
+        self.memo = memo or DetectionMemo.open(
+            config.config_file_path.parent / DetectionMemo.FILE_NAME
+        )
+        self.autosave = autosave
+
+    async def detect(
+        self, policy: ResolutionPolicy | None = None, use_memo: bool = True
+    ) -> DetectionResult:
+        """Detect the game by its executable hash and file layout.
+
+        Conflicting candidates are resolved by ``policy``, which defaults to
+        the ``DETECTION_POLICY`` environment variable. The result is memoized
+        and reused while the game files and the database are unchanged.
+        """
+        with Profiler.span("detection"):
+            return await self._detect_memoized(policy, use_memo)
+
+    async def _detect_memoized(
+        self, policy: ResolutionPolicy | None, use_memo: bool
+    ) -> DetectionResult:
+        if policy is None:
+            policy = EnvUtils.get_detection_policy()
+
+        await self.database.load(*DetectionIndex.TABLES)
+        database_hash = self.database.get_content_hash(*DetectionIndex.TABLES)
+
+        if use_memo:
+            entry = await asyncio.to_thread(
+                self.memo.get, self.game_path, policy, database_hash
+            )
+            if entry is not None:
+                self.probed_paths = {self._normalize(path) for path in entry.signature}
+                return self._restore(entry)
+
+        detection_index = await self.database.get_detection_index()
+        paths = {
+            path for candidate in detection_index.candidates for path in candidate.paths
+        } | {
+            path
+            for executable in detection_index.hashed_executables.values()
+            for path in (executable.path, executable.tl_path)
+        }
+        self.probed_paths = {self._normalize(path) for path in paths}
+
+        result = await self._detect(policy, detection_index, paths)
+
+        signature = await asyncio.to_thread(
+            DetectionMemo.get_signature, self.game_path, paths
+        )
+        await asyncio.to_thread(
+            self.memo.put,
+            self.game_path,
+            DetectionMemoEntry(
+                policy=policy,
+                database_hash=database_hash,
+                signature=signature,
+                metadata=MetadataUtils.to_id(result.metadata),
+                executable=result.executable.id if result.executable else None,
+                trace=result.trace,
+            ),
+        )
+        if self.autosave:
+            await asyncio.to_thread(self.memo.save)
+        return result
+
+    def _restore(self, entry: DetectionMemoEntry) -> DetectionResult:
+        """Resolve the IDs of a memoized detection result."""
+        return DetectionResult(
+            metadata=DetectionIndex.resolve_metadata(self.database, entry.metadata),
+            executable=self.database.get_table_element(
+                entry.executable, GameExecutableTable, GameExecutable
+            )
+            if entry.executable
+            else None,
+            trace=[*entry.trace, "Reused the memoized detection result."],
+        )
+
+    async def _detect(
+        self,
+        policy: ResolutionPolicy,
+        detection_index: DetectionIndex,
+        paths: set[str],
+    ) -> DetectionResult:
+        """Detect the game from scratch."""
+        existing = await self._list_entries(paths)
+
+        with Profiler.span("hashing"):
+            hash_candidate = await asyncio.to_thread(
+                self._identify_by_hash, detection_index, existing
+            )
+        candidates = [
+            candidate
+            for candidate in detection_index.candidates
+            if all(self._normalize(path) in existing for path in candidate.paths)
+        ]
+
+        if policy is not ResolutionPolicy.INTERACTIVE:
+            resolution = MetadataResolver(policy).resolve(candidates, hash_candidate)
+            return DetectionResult(
+                resolution.metadata, resolution.executable, resolution.trace
+            )
+
+        if hash_candidate is not None:
+            return DetectionResult(
+                metadata=replace(hash_candidate.metadata),
+                executable=hash_candidate.executable,
+                trace=[f"Executable hash matched {hash_candidate.mapping.id}."],
+            )
+
+        result = DetectionResult(trace=[f"Policy: {policy}"])
+        if self.config.app_mode is AppMode.GUI:
+            # Tk dialogs have to be shown from the thread of the GUI
+            self._apply_candidates(result, candidates)
+        else:
+            # Prompts may wait for a daemon client, so keep the loop free
+            await asyncio.to_thread(self._apply_candidates, result, candidates)
+
+        return result
+
+    def is_relevant(self, path: Path) -> bool:
+        """Check whether a change to ``path`` may change the detection result."""
+        try:
+            relative_path = path.relative_to(self.game_path)
+        except ValueError:
+            return False
+
+        if relative_path == Path():
+            return True
+
+        normalized = self._normalize(relative_path)
+        return any(
+            path == normalized or path.startswith(normalized + os.sep)
+            for path in self.probed_paths
+        )
+
+    def _identify_by_hash(
+        self, detection_index: DetectionIndex, existing: set[str]
+    ) -> DetectionCandidate | None:
+        """Look up the SHA-256 of each executable whose size matches a known build."""
+        try:
+            for executable_id, sizes in detection_index.known_sizes.items():
+                executable = detection_index.hashed_executables[executable_id]
+                if not all(
+                    self._normalize(path) in existing
+                    for path in (executable.path, executable.tl_path)
+                ):
+                    continue
+
+                file_path = self.game_path / executable.path
+                try:
+                    if file_path.stat().st_size not in sizes:
+                        continue
+                    sha256 = self.checksum_cache.get_checksums(
+                        file_path, [HashAlgorithm.SHA256], self.hasher
+                    )[HashAlgorithm.SHA256]
+                except OSError as e:
+                    print(f"Warning: Failed to hash {file_path}: {e}", file=sys.stderr)
+                    continue
+
+                candidate = detection_index.by_sha256.get(sha256)
+                if candidate is not None and candidate.executable.id == executable_id:
+                    return candidate
+        finally:
+            if self.autosave:
+                self.checksum_cache.save()
+
+        return None
+
+    async def _list_entries(self, paths: set[str]) -> set[str]:
+        """List the directories containing the given paths once each.
+
+        Every directory is scanned in a worker thread instead of checking each
+        path separately, which matters when the game lives on a network share.
+        """
+        directories = {PurePath(path).parent for path in paths}
+        listings = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._scan_directory, directory)
+                for directory in directories
+            )
+        )
+        return set().union(*listings)
+
+    def _scan_directory(self, directory: PurePath) -> set[str]:
+        """Get the normalized game-relative paths of a directory's entries."""
+        try:
+            with os.scandir(self.game_path / directory) as entries:
+                return {self._normalize(directory / entry.name) for entry in entries}
+        except OSError:
+            return set()
+
+    @staticmethod
+    def _normalize(path: str | PurePath) -> str:
+        """Normalize a game-relative path for comparisons on this platform."""
+        return os.path.normcase(PurePath(path))
+
+    def _apply_candidates(
+        self, result: DetectionResult, candidates: list[DetectionCandidate]
+    ) -> None:
+        """Merge the metadata of all candidates, asking about each change."""
+        for candidate in candidates:
+            self._apply_candidate(result, candidate)
+
+    def _apply_candidate(
+        self, result: DetectionResult, candidate: DetectionCandidate
+    ) -> None:
+        """Merge the metadata of a detection candidate whose files exist."""
+
+        changes = MetadataUtils.calc_changes(result.metadata, candidate.metadata)
+        decisions: list[tuple[str, Any]] = []
+
+        for change in changes:
+            answer = DialogUtils.ask_yes_no(
+                self.config.app_mode,
+                f"Change {change[0]} from {change[1][1]} to {change[1][0]}?",
+            )
+
+            decisions.append((change[0], change[1][0] if answer else change[1][1]))
+
+        MetadataUtils.merge(result.metadata, candidate.metadata, decisions)
+        result.executable = candidate.executable
+        result.trace.append(f"Applied {candidate.mapping.id}")
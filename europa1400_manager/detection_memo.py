@@ -0,0 +1,129 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar, Iterable
+
+from dataclass_wizard import JSONWizard
+
+from europa1400_manager.models import GameMetadataId
+
+
+@dataclass
+class DetectionMemoEntry(JSONWizard):
+    """A detection result with the state of everything it was derived from."""
+
+    policy: str
+    database_hash: str
+    signature: dict[str, list[int]]
+    metadata: GameMetadataId
+    executable: str | None = None
+    trace: list[str] = field(default_factory=list)
+
+
+@dataclass
+class DetectionMemoData(JSONWizard):
+    entries: dict[str, DetectionMemoEntry] = field(default_factory=dict)
+
+
+class DetectionMemo:
+    """Persistent detection results keyed by game path.
+
+    An entry is only reused while the policy, the content of the detection
+    tables and the stat data of every probed path are unchanged. One memo
+    may be shared by detections running in several threads.
+    """
+
+    FILE_NAME = "detection.json"
+
+    _instances: ClassVar[dict[Path, "DetectionMemo"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._data: DetectionMemoData | None = None
+        self._is_dirty = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path) -> "DetectionMemo":
+        """Get the memo of a file, shared by everything in this process.
+
+        Separate instances over one file would overwrite each other's entries
+        whenever they save.
+        """
+        with cls._instances_lock:
+            key = path.absolute()
+            if (instance := cls._instances.get(key)) is None:
+                instance = cls._instances[key] = cls(path)
+            return instance
+
+    @property
+    def data(self) -> DetectionMemoData:
+        """The memo contents, read from disk on first access."""
+        with self._lock:
+            if self._data is None:
+                self._data = self._read()
+            return self._data
+
+    def get(
+        self, game_path: Path, policy: str, database_hash: str
+    ) -> DetectionMemoEntry | None:
+        """Get the memoized result for a game path if it is still valid."""
+        entry = self.data.entries.get(self._key(game_path))
+        if (
+            entry is None
+            or entry.policy != policy
+            or entry.database_hash != database_hash
+            or self.get_signature(game_path, entry.signature.keys()) != entry.signature
+        ):
+            return None
+        return entry
+
+    def put(self, game_path: Path, entry: DetectionMemoEntry) -> None:
+        """Store a detection result until the memo is saved."""
+        data = self.data
+        with self._lock:
+            data.entries[self._key(game_path)] = entry
+            self._is_dirty = True
+
+    def save(self) -> None:
+        """Write the memo to disk if it changed."""
+        with self._lock:
+            if not self._is_dirty or self._data is None:
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+            tmp_path.write_text(self._data.to_json())
+            os.replace(tmp_path, self.path)
+            self._is_dirty = False
+
+    @staticmethod
+    def get_signature(game_path: Path, paths: Iterable[str]) -> dict[str, list[int]]:
+        """Get the size, mtime and inode of each path, or nothing if it is missing."""
+        signature: dict[str, list[int]] = {}
+        for path in sorted(paths):
+            try:
+                stat_result = os.stat(game_path / path)
+            except OSError:
+                signature[path] = []
+                continue
+            signature[path] = [
+                stat_result.st_size,
+                stat_result.st_mtime_ns,
+                stat_result.st_ino,
+            ]
+        return signature
+
+    def _read(self) -> DetectionMemoData:
+        try:
+            data = DetectionMemoData.from_json(self.path.read_text())
+        except (OSError, ValueError):
+            return DetectionMemoData()
+
+        return data if isinstance(data, DetectionMemoData) else DetectionMemoData()
+
+    @staticmethod
+    def _key(game_path: Path) -> str:
+        return str(game_path.absolute())
@@ -0,0 +1,197 @@
+import contextvars
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ClassVar
+
+from dataclass_wizard import JSONWizard
+from dataclass_wizard.errors import JSONWizardError
+
+from europa1400_manager.const import HashAlgorithm
+from europa1400_manager.hashing import FileHasher
+from europa1400_manager.profiler import Profiler
+
+
+@dataclass
+class FingerprintEntry(JSONWizard):
+    """Size, modification time and digest of one game file."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+@dataclass
+class Fingerprint(JSONWizard):
+    """Manifest of all files of a game installation."""
+
+    FILE_NAME: ClassVar[str] = "fingerprint.json"
+
+    algorithm: HashAlgorithm
+    entries: list[FingerprintEntry] = field(default_factory=list)
+
+    def to_file(self, path: Path) -> None:
+        """Write the manifest to a file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json())
+
+    @classmethod
+    def from_file(cls, path: Path) -> "Fingerprint":
+        """Read a manifest from a file.
+
+        Raises :class:`OSError` if the file cannot be read and
+        :class:`ValueError` if it is not a valid manifest.
+        """
+        try:
+            fingerprint = cls.from_json(path.read_text())
+        except JSONWizardError as e:
+            raise ValueError(str(e)) from e
+        if not isinstance(fingerprint, cls):
+            raise ValueError(
+                f"Expected instance of {cls.__name__}, got {type(fingerprint).__name__}"
+            )
+        return fingerprint
+
+
+@dataclass
+class FingerprintMismatch:
+    """A file that differs from its fingerprint entry."""
+
+    path: str
+    reason: str
+
+
+class GameFingerprinter:
+    """Hashes all files of a game directory across a thread pool.
+
+    The digests release the GIL while hashing, so threads scale across cores
+    without the cost of sending file contents between processes.
+    """
+
+    def __init__(
+        self,
+        game_path: Path,
+        algorithm: HashAlgorithm = HashAlgorithm.SHA256,
+        max_workers: int | None = None,
+    ) -> None:
+        self.game_path = game_path
+        self.algorithm = algorithm
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._local = threading.local()
+
+    def create(self) -> Fingerprint:
+        """Hash every file below the game path."""
+        files = sorted(self._walk(), key=lambda file: file[0])
+        entries: list[FingerprintEntry] = []
+
+        with (
+            Profiler.span("hashing"),
+            ThreadPoolExecutor(self.max_workers) as executor,
+        ):
+            futures = [
+                self._submit(executor, path, self.algorithm) for path, _ in files
+            ]
+            for (path, stat_result), future in zip(files, futures):
+                try:
+                    digest = future.result()
+                except OSError as e:
+                    print(f"Warning: Skipping {path}: {e}", file=sys.stderr)
+                    continue
+                entries.append(
+                    FingerprintEntry(
+                        path=path,
+                        size=stat_result.st_size,
+                        mtime_ns=stat_result.st_mtime_ns,
+                        digest=digest,
+                    )
+                )
+
+        return Fingerprint(algorithm=self.algorithm, entries=entries)
+
+    def verify(
+        self, fingerprint: Fingerprint, full: bool = False
+    ) -> FingerprintMismatch | None:
+        """Compare the game files with a manifest, stopping at the first mismatch.
+
+        Files whose size differs are reported without hashing them. Unless
+        ``full`` is set, files whose size and modification time both match are
+        assumed to be unchanged, so only touched files are hashed.
+        """
+        to_hash: list[FingerprintEntry] = []
+
+        for entry in fingerprint.entries:
+            try:
+                stat_result = os.stat(self.game_path / entry.path)
+            except OSError:
+                return FingerprintMismatch(entry.path, "missing")
+
+            if stat_result.st_size != entry.size:
+                return FingerprintMismatch(
+                    entry.path, f"size {stat_result.st_size} != {entry.size}"
+                )
+            if full or stat_result.st_mtime_ns != entry.mtime_ns:
+                to_hash.append(entry)
+
+        with (
+            Profiler.span("hashing"),
+            ThreadPoolExecutor(self.max_workers) as executor,
+        ):
+            pending: dict[Future[str], FingerprintEntry] = {
+                self._submit(executor, entry.path, fingerprint.algorithm): entry
+                for entry in to_hash
+            }
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        entry = pending.pop(future)
+                        try:
+                            digest = future.result()
+                        except OSError as e:
+                            return FingerprintMismatch(entry.path, f"unreadable: {e}")
+                        if digest != entry.digest:
+                            return FingerprintMismatch(entry.path, "digest differs")
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return None
+
+    def _walk(self) -> list[tuple[str, os.stat_result]]:
+        """List all regular files below the game path with their stat data."""
+        files: list[tuple[str, os.stat_result]] = []
+        directories = [self.game_path]
+
+        while directories:
+            directory = directories.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(Path(entry.path))
+                        elif entry.is_file():
+                            relative_path = Path(entry.path).relative_to(self.game_path)
+                            files.append((relative_path.as_posix(), entry.stat()))
+            except OSError as e:
+                print(f"Warning: Skipping {directory}: {e}", file=sys.stderr)
+
+        return files
+
+    def _submit(
+        self, executor: ThreadPoolExecutor, path: str, algorithm: HashAlgorithm
+    ) -> Future[str]:
+        """Hash a game file on the pool in a copy of the current context."""
+        context = contextvars.copy_context()
+        return executor.submit(context.run, self._hash, path, algorithm)
+
+    def _hash(self, path: str, algorithm: HashAlgorithm) -> str:
+        """Hash a game file with the hasher of the current worker thread."""
+        hasher: FileHasher | None = getattr(self._local, "hasher", None)
+        if hasher is None:
+            hasher = self._local.hasher = FileHasher()
+
+        return hasher.hash_file(self.game_path / path, [algorithm])[algorithm]
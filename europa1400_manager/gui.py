@@ -12,6 +12,7 @@ from europa1400_manager.modules.config_module_gui import ConfigModuleGui
 from europa1400_manager.modules.info_module_gui import InfoModuleGui
 from europa1400_manager.modules.license_module_gui import LicenseModuleGui
 from europa1400_manager.modules.patch_module_gui import PatchModuleGui
+from europa1400_manager.profiler import Profiler
 
 
 class Gui:
@@ -31,19 +32,20 @@ class Gui:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(expand=True, fill=tk.BOTH)
 
-        info_module = InfoModuleGui(
-            config, database, event_emitter, self.root, self.notebook
-        )
-        config_module = ConfigModuleGui(
-            config, database, event_emitter, self.root, self.notebook
-        )
-        license_module = LicenseModuleGui(
-            config, database, event_emitter, self.root, self.notebook
-        )
+        with Profiler.span("construct modules"):
+            info_module = InfoModuleGui(
+                config, database, event_emitter, self.root, self.notebook
+            )
+            config_module = ConfigModuleGui(
+                config, database, event_emitter, self.root, self.notebook
+            )
+            license_module = LicenseModuleGui(
+                config, database, event_emitter, self.root, self.notebook
+            )
 
-        patch_module = PatchModuleGui(
-            config, database, event_emitter, self.root, self.notebook
-        )
+            patch_module = PatchModuleGui(
+                config, database, event_emitter, self.root, self.notebook
+            )
         self.modules: list[BaseModuleGui] = [
             info_module,
             config_module,
@@ -0,0 +1,96 @@
+import hashlib
+import mmap
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterable, Protocol
+
+from europa1400_manager.const import HashAlgorithm
+
+
+class _Hasher(Protocol):
+    def update(self, data: bytes | memoryview, /) -> None: ...
+
+    def hexdigest(self) -> str: ...
+
+
+class _Crc32:
+    """CRC32 with the same interface as the :mod:`hashlib` hashers."""
+
+    def __init__(self) -> None:
+        self._value = 0
+
+    def update(self, data: bytes | memoryview, /) -> None:
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+class FileHasher:
+    """Computes several digests of a file in a single read pass.
+
+    Small files are read with ``readinto`` into a preallocated buffer that
+    is reused between files. Each thread gets its own buffer, so one hasher
+    can be shared by worker threads. Files of at least ``MMAP_THRESHOLD``
+    bytes are memory-mapped instead and hashed window by window without
+    copying.
+    """
+
+    BUFFER_SIZE = 1024 * 1024
+    MMAP_THRESHOLD = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        buffer_size: int = BUFFER_SIZE,
+        mmap_threshold: int | None = MMAP_THRESHOLD,
+    ) -> None:
+        self.buffer_size = buffer_size
+        self.mmap_threshold = mmap_threshold
+        self._local = threading.local()
+
+    def hash_file(
+        self, file_path: Path, algorithms: Iterable[HashAlgorithm]
+    ) -> dict[HashAlgorithm, str]:
+        """Compute the given digests of a file."""
+        hashers = {
+            algorithm: self._create_hasher(algorithm) for algorithm in algorithms
+        }
+
+        with file_path.open("rb", buffering=0) as file:
+            size = os.fstat(file.fileno()).st_size
+            if (
+                self.mmap_threshold is not None
+                and size > 0
+                and size >= self.mmap_threshold
+            ):
+                with (
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                    memoryview(mapped) as view,
+                ):
+                    for offset in range(0, size, self.buffer_size):
+                        with view[offset : offset + self.buffer_size] as chunk:
+                            for hasher in hashers.values():
+                                hasher.update(chunk)
+            else:
+                buffer = self._get_buffer()
+                while read := file.readinto(buffer):
+                    chunk = buffer[:read]
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
+
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+    def _get_buffer(self) -> memoryview:
+        """Get the read buffer of the current thread."""
+        buffer: memoryview | None = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = memoryview(bytearray(self.buffer_size))
+        return buffer
+
+    @staticmethod
+    def _create_hasher(algorithm: HashAlgorithm) -> _Hasher:
+        if algorithm is HashAlgorithm.CRC32:
+            return _Crc32()
+        return hashlib.new(algorithm.value)
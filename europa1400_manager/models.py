@@ -6,9 +6,10 @@ from typing import Any, ClassVar
 from dataclass_wizard import YAMLWizard
 
 
-def table(filename: str) -> Any:
+def table(filename: str, optional: bool = False) -> Any:
     def wrapper(cls: type[Any]) -> type[Any]:
         cls.FILE_NAME = filename
+        cls.IS_OPTIONAL = optional
         return cls
 
     return wrapper
@@ -61,6 +62,12 @@ class GameExecutableToMetadata(DatabaseElement):
     metadata: GameMetadataId
 
 
+@dataclass
+class GameExecutableHash(GameExecutableToMetadata):
+    size: int
+    sha256: str
+
+
 @dataclass
 class GamePatch(NamedDatabaseElement):
     pass
@@ -75,6 +82,8 @@ class GameMetadataToPatch(DatabaseElement):
 @dataclass
 class DatabaseTable(YAMLWizard):
     FILE_NAME: ClassVar[str]
+    # Optional tables may be missing from the database and are then empty
+    IS_OPTIONAL: ClassVar[bool] = False
 
     id: str
     name: str
@@ -123,6 +132,12 @@ class GameExecutableToMetadataTable(DatabaseTable):
     elements: list[GameExecutableToMetadata]
 
 
+@dataclass
+@table("executable_hash.yml", optional=True)
+class GameExecutableHashTable(DatabaseTable):
+    elements: list[GameExecutableHash]
+
+
 @dataclass
 @table("patch.yml")
 class GamePatchTable(DatabaseTable):
@@ -135,6 +150,20 @@ class GameMetadataToPatchTable(DatabaseTable):
     elements: list[GameMetadataToPatch]
 
 
+@dataclass
+class DatabaseManifestFile(YAMLWizard):
+    name: str
+    sha256: str
+    size: int
+
+
+@dataclass
+class DatabaseManifest(YAMLWizard):
+    FILE_NAME: ClassVar[str] = "manifest.yml"
+
+    files: list[DatabaseManifestFile]
+
+
 @dataclass
 class GameMetadataId(YAMLWizard):
     edition: str | None = None
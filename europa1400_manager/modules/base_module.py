@@ -1,5 +1,7 @@
+import functools
 import inspect
 from abc import ABC
+from typing import Any, Callable
 
 from europa1400_manager.async_typer import AsyncTyper
 from europa1400_manager.config import Config
@@ -11,26 +13,64 @@ class BaseModule(ABC):
     NAME: str
     FRIENDLY_NAME: str
     app_mode: AppMode
-    typer_app: AsyncTyper
 
     def __init__(self, config: Config, database: Database) -> None:
         self.config = config
         self.database = database
 
-        self.typer_app = AsyncTyper(no_args_is_help=True)
-        self.typer_app.info.name = self.NAME
-        self.typer_app.info.help = f"{self.FRIENDLY_NAME} module"
+    @classmethod
+    def create_typer_app(cls, get_instance: Callable[[], "BaseModule"]) -> AsyncTyper:
+        """Create the Typer app of this module from its class.
 
-        self._register_commands()
+        Every public method becomes a command that calls ``get_instance`` when
+        it is dispatched, so the module does not need to exist beforehand.
+        """
+        typer_app = AsyncTyper(no_args_is_help=True)
+        typer_app.info.name = cls.NAME
+        typer_app.info.help = f"{cls.FRIENDLY_NAME} module"
 
-    def _register_commands(self) -> None:
-        for attr_name, method in inspect.getmembers(self, predicate=inspect.ismethod):
+        for attr_name, function in inspect.getmembers(
+            cls, predicate=inspect.isfunction
+        ):
             if attr_name in BaseModule.__dict__:
                 continue
             if attr_name.startswith("_"):
                 continue
+            if isinstance(inspect.getattr_static(cls, attr_name), staticmethod):
+                continue
 
-            command = self.typer_app.command(
-                name=attr_name.replace("_", "-"), help=method.__doc__ or ""
+            command = typer_app.command(
+                name=attr_name.replace("_", "-"), help=function.__doc__ or ""
             )
-            command(method)
+            command(cls._bind_command(function, get_instance))
+
+        return typer_app
+
+    @staticmethod
+    def _bind_command(
+        function: Callable[..., Any], get_instance: Callable[[], "BaseModule"]
+    ) -> Callable[..., Any]:
+        """Wrap an unbound method so it is called on the module when dispatched."""
+        command: Callable[..., Any]
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_command(*args: Any, **kwargs: Any) -> Any:
+                return await function(get_instance(), *args, **kwargs)
+
+            command = async_command
+        else:
+
+            @functools.wraps(function)
+            def sync_command(*args: Any, **kwargs: Any) -> Any:
+                return function(get_instance(), *args, **kwargs)
+
+            command = sync_command
+
+        signature = inspect.signature(function)
+        setattr(
+            command,
+            "__signature__",
+            signature.replace(parameters=list(signature.parameters.values())[1:]),
+        )
+        return command
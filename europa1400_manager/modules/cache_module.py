@@ -0,0 +1,44 @@
+import time
+
+import typer
+
+from europa1400_manager.modules.base_module import BaseModule
+
+
+class CacheModule(BaseModule):
+    NAME = "cache"
+    FRIENDLY_NAME = "Cache"
+
+    def info(self) -> None:
+        """Show the cached database files."""
+        cache = self.database.cache
+        entries = cache.entries()
+
+        typer.echo(f"Cache directory: {cache.path.absolute()}")
+        typer.echo(f"Max age: {cache.max_age:g} seconds")
+        typer.echo(f"Compiled tables: {self.database.snapshot.table_count}")
+
+        if not entries:
+            typer.echo("The cache is empty.")
+            return
+
+        now = time.time()
+        for entry in entries:
+            if entry.missing:
+                typer.echo(
+                    f"{entry.url}: not found, "
+                    f"checked {now - entry.fetched_at:.0f} seconds ago"
+                )
+                continue
+            typer.echo(
+                f"{entry.url}: {entry.size} bytes, "
+                f"revalidated {now - entry.fetched_at:.0f} seconds ago, "
+                f"ETag {entry.etag or '-'}, "
+                f"Last-Modified {entry.last_modified or '-'}"
+            )
+
+    def clear(self) -> None:
+        """Remove all cached database files."""
+        self.database.snapshot.clear()
+        self.database.cache.clear()
+        typer.echo("Cache cleared.")
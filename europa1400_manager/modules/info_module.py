@@ -1,31 +1,21 @@
-import hashlib
+import asyncio
+import json
+import time
 from pathlib import Path
-from typing import Any
 
 import typer
 
+from europa1400_manager.checksum_cache import ChecksumCache
 from europa1400_manager.config import Config
-from europa1400_manager.const import AppMode
+from europa1400_manager.const import AppMode, HashAlgorithm, ResolutionPolicy
 from europa1400_manager.database import Database
-from europa1400_manager.models import (
-    GameDistribution,
-    GameDistributionTable,
-    GameDrm,
-    GameDrmTable,
-    GameEdition,
-    GameEditionTable,
-    GameExecutable,
-    GameExecutableTable,
-    GameExecutableToMetadata,
-    GameExecutableToMetadataTable,
-    GameLanguage,
-    GameLanguageTable,
-    GameMetadata,
-    GameVersion,
-    GameVersionTable,
-)
+from europa1400_manager.detection import GameDetector
+from europa1400_manager.fingerprint import Fingerprint, GameFingerprinter
+from europa1400_manager.hashing import FileHasher
+from europa1400_manager.models import GameExecutable, GameMetadata
 from europa1400_manager.modules.base_module import BaseModule
-from europa1400_manager.utils import DialogUtils, MetadataUtils
+from europa1400_manager.profiler import Profiler
+from europa1400_manager.scanner import InstallScanner
 
 
 class InfoModule(BaseModule):
@@ -33,18 +23,57 @@ class InfoModule(BaseModule):
     FRIENDLY_NAME = "Information"
     game_metadata: GameMetadata = GameMetadata()
     executable: GameExecutable | None = None
+    detection_trace: list[str] = []
 
     def __init__(self, config: Config, database: Database) -> None:
         super().__init__(config, database)
 
-        self._reload_game_metadata()
+        self.checksum_cache = ChecksumCache.open(
+            config.config_file_path.parent / ChecksumCache.FILE_NAME
+        )
+        self.hasher = FileHasher()
+        self.detector = GameDetector(config, database, self.checksum_cache, self.hasher)
+        self._is_game_metadata_loaded = False
 
-    def show(self) -> None:
+    async def show(
+        self,
+        policy: ResolutionPolicy | None = typer.Option(
+            None, help="How to resolve conflicting detection candidates."
+        ),
+        explain: bool = typer.Option(
+            False, "--explain", help="Show how the game metadata was detected."
+        ),
+        refresh: bool = typer.Option(
+            False, "--refresh", help="Detect again even if nothing changed."
+        ),
+    ) -> None:
         """Display the game information."""
+        if policy is not None or refresh:
+            await self._reload_game_metadata(policy, use_memo=not refresh)
+        else:
+            await self._ensure_game_metadata()
+
         typer.echo(self.game_metadata)
 
-    def checksums(self) -> list[tuple[Path, str]] | None:
+        if explain:
+            for line in self.detection_trace:
+                typer.echo(line)
+
+    async def checksums(
+        self,
+        algorithms: list[HashAlgorithm] = typer.Option(
+            [HashAlgorithm.MD5],
+            "--algorithm",
+            "-a",
+            help="Checksum algorithm to compute. Can be given multiple times.",
+        ),
+        verify: bool = typer.Option(
+            False, "--verify", help="Re-hash the files even if they are cached."
+        ),
+    ) -> list[tuple[Path, dict[HashAlgorithm, str]]] | None:
         """Display checksums of the game files."""
+        await self._ensure_game_metadata()
+
         if (
             self.game_metadata.edition is None
             or self._executable_path is None
@@ -52,19 +81,137 @@ class InfoModule(BaseModule):
         ):
             return None
 
-        executable_checksum = self._calculate_checksum(self._executable_path)
-        tl_executable_checksum = self._calculate_checksum(self._tl_executable_path)
+        with Profiler.span("hashing"):
+            executable_checksums = self._get_checksums(
+                self._executable_path, algorithms, verify
+            )
+            tl_executable_checksums = self._get_checksums(
+                self._tl_executable_path, algorithms, verify
+            )
+
+        self.checksum_cache.evict_missing()
+        self.checksum_cache.save()
 
         checksums = [
-            (self._executable_path, executable_checksum),
-            (self._tl_executable_path, tl_executable_checksum),
+            (self._executable_path, executable_checksums),
+            (self._tl_executable_path, tl_executable_checksums),
         ]
 
         if self.config.app_mode is AppMode.CLI:
-            typer.echo(checksums)
+            for path, file_checksums in checksums:
+                typer.echo(path)
+                for algorithm, checksum in file_checksums.items():
+                    typer.echo(f"  {algorithm}: {checksum}")
 
         return checksums
 
+    async def fingerprint(
+        self,
+        output: Path | None = typer.Option(
+            None, "--output", "-o", help="Manifest file to write."
+        ),
+        algorithm: HashAlgorithm = typer.Option(
+            HashAlgorithm.SHA256, "--algorithm", "-a", help="Digest algorithm."
+        ),
+        workers: int | None = typer.Option(
+            None, "--workers", "-w", help="Number of hashing threads."
+        ),
+    ) -> Fingerprint:
+        """Hash all game files and write them to a manifest."""
+        manifest_path = output or self._default_fingerprint_path
+        fingerprinter = GameFingerprinter(self.config.game_path, algorithm, workers)
+
+        start = time.perf_counter()
+        fingerprint = await asyncio.to_thread(fingerprinter.create)
+        fingerprint.to_file(manifest_path)
+        elapsed = time.perf_counter() - start
+
+        if self.config.app_mode is AppMode.CLI:
+            size = sum(entry.size for entry in fingerprint.entries)
+            typer.echo(
+                f"Fingerprinted {len(fingerprint.entries)} files "
+                f"({size / 1024 / 1024:.1f} MiB) in {elapsed:.2f} s: {manifest_path}"
+            )
+
+        return fingerprint
+
+    async def verify(
+        self,
+        manifest: Path | None = typer.Option(
+            None, "--manifest", "-m", help="Manifest file to verify against."
+        ),
+        full: bool = typer.Option(
+            False, "--full", help="Hash all files, even if size and mtime match."
+        ),
+        workers: int | None = typer.Option(
+            None, "--workers", "-w", help="Number of hashing threads."
+        ),
+    ) -> bool:
+        """Verify the game files against a fingerprint manifest."""
+        manifest_path = manifest or self._default_fingerprint_path
+        try:
+            fingerprint = Fingerprint.from_file(manifest_path)
+        except (OSError, ValueError) as e:
+            raise typer.BadParameter(
+                f"Cannot read manifest {manifest_path}: {e}",
+                param_hint="'--manifest' / '-m'",
+            )
+        fingerprinter = GameFingerprinter(
+            self.config.game_path, fingerprint.algorithm, workers
+        )
+
+        mismatch = await asyncio.to_thread(fingerprinter.verify, fingerprint, full)
+
+        if self.config.app_mode is AppMode.CLI:
+            if mismatch is None:
+                typer.echo(f"Verified {len(fingerprint.entries)} files.")
+            else:
+                typer.echo(f"Mismatch: {mismatch.path}: {mismatch.reason}", err=True)
+                raise typer.Exit(1)
+
+        return mismatch is None
+
+    async def scan(
+        self,
+        root: Path = typer.Argument(..., help="Directory to search for installs."),
+        concurrency: int = typer.Option(
+            8, "--concurrency", "-c", help="Maximum number of parallel directory scans."
+        ),
+        policy: ResolutionPolicy = typer.Option(
+            ResolutionPolicy.HASH_CONFIRMED,
+            help="How to resolve conflicting detection candidates.",
+        ),
+        algorithms: list[HashAlgorithm] = typer.Option(
+            [],
+            "--algorithm",
+            "-a",
+            help="Checksum algorithm to compute. Can be given multiple times.",
+        ),
+    ) -> None:
+        """Find all game installations below a directory and print them as NDJSON."""
+        if policy is ResolutionPolicy.INTERACTIVE:
+            raise typer.BadParameter(
+                "Installs are detected concurrently and cannot prompt.",
+                param_hint="'--policy'",
+            )
+
+        scanner = InstallScanner(
+            self.config,
+            self.database,
+            self.checksum_cache,
+            concurrency,
+            policy,
+            algorithms,
+        )
+
+        async for result in scanner.scan(root):
+            typer.echo(json.dumps(result.to_dict()))
+
+    @property
+    def _default_fingerprint_path(self) -> Path:
+        """Get the default path of the fingerprint manifest."""
+        return self.config.config_file_path.parent / Fingerprint.FILE_NAME
+
     @property
     def _executable_path(self) -> Path | None:
         """Get the path to the game executable."""
@@ -81,71 +228,44 @@ class InfoModule(BaseModule):
 
         return self.config.game_path / self.executable.tl_path
 
-    def _reload_game_metadata(self) -> None:
-        """Redetermine the game metadata by re-applying candidate groups."""
-        self.game_metadata = GameMetadata()
-        executable_mappings = self.database.get_table_elements(
-            GameExecutableToMetadataTable, GameExecutableToMetadata
-        )
-        for executable_mapping in executable_mappings:
-            self._apply_executable_mapping(executable_mapping)
-
-    def _apply_executable_mapping(
-        self, executable_mapping: GameExecutableToMetadata
-    ) -> None:
-        """Apply a group of candidate executable files to the game information."""
-        game_executable = self.database.get_table_element(
-            executable_mapping.executable, GameExecutableTable, GameExecutable
-        )
-
-        exe_path = self.config.game_path / game_executable.path
-        tl_exe_path = self.config.game_path / game_executable.tl_path
-
-        if not exe_path.exists() or not tl_exe_path.exists():
-            return
+    async def _ensure_game_metadata(self) -> None:
+        """Determine the game metadata unless it is known for the game path."""
+        if (
+            not self._is_game_metadata_loaded
+            or self.detector.game_path != self.config.game_path
+        ):
+            await self._reload_game_metadata()
 
-        game_metadata = GameMetadata()
-        if executable_mapping.metadata.edition:
-            game_metadata.edition = self.database.get_table_element(
-                executable_mapping.metadata.edition, GameEditionTable, GameEdition
-            )
-        if executable_mapping.metadata.version:
-            game_metadata.version = self.database.get_table_element(
-                executable_mapping.metadata.version, GameVersionTable, GameVersion
-            )
-        if executable_mapping.metadata.distribution:
-            game_metadata.distribution = self.database.get_table_element(
-                executable_mapping.metadata.distribution,
-                GameDistributionTable,
-                GameDistribution,
-            )
-        if executable_mapping.metadata.language:
-            game_metadata.language = self.database.get_table_element(
-                executable_mapping.metadata.language, GameLanguageTable, GameLanguage
-            )
-        if executable_mapping.metadata.drm:
-            game_metadata.drm = self.database.get_table_element(
-                executable_mapping.metadata.drm, GameDrmTable, GameDrm
-            )
+    def _invalidate(self, changed_paths: set[Path]) -> bool:
+        """Forget the detection and checksums affected by changed files.
 
-        changes = MetadataUtils.calc_changes(self.game_metadata, game_metadata)
-        decisions: list[tuple[str, Any]] = []
+        Returns whether the detection has to be redone.
+        """
+        self.checksum_cache.invalidate(changed_paths)
 
-        for change in changes:
-            result = DialogUtils.ask_yes_no(
-                self.config.app_mode,
-                f"Change {change[0]} from {change[1][1]} to {change[1][0]}?",
-            )
+        if any(self.detector.is_relevant(path) for path in changed_paths):
+            self._is_game_metadata_loaded = False
+        return not self._is_game_metadata_loaded
 
-            decisions.append((change[0], change[1][0] if result else change[1][1]))
+    async def _reload_game_metadata(
+        self, policy: ResolutionPolicy | None = None, use_memo: bool = True
+    ) -> None:
+        """Redetermine the game metadata by re-applying candidate groups."""
+        self.detector.game_path = self.config.game_path
+        result = await self.detector.detect(policy, use_memo)
 
-        MetadataUtils.merge(self.game_metadata, game_metadata, decisions)
-        self.executable = game_executable
+        self.game_metadata = result.metadata
+        self.executable = result.executable
+        self.detection_trace = result.trace
+        self._is_game_metadata_loaded = True
 
-    def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate the checksum of a file."""
-        hash_md5 = hashlib.md5()
-        with file_path.open("rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+    def _get_checksums(
+        self,
+        file_path: Path,
+        algorithms: list[HashAlgorithm],
+        verify: bool = False,
+    ) -> dict[HashAlgorithm, str]:
+        """Get checksums of a file, reusing cached ones if the file is unchanged."""
+        return self.checksum_cache.get_checksums(
+            file_path, algorithms, self.hasher, verify
+        )
@@ -1,14 +1,20 @@
 import tkinter as tk
 from dataclasses import dataclass
+from pathlib import Path
 from tkinter import ttk
 
 from pyee import EventEmitter
 
 from europa1400_manager.config import Config
-from europa1400_manager.const import EVENT_UPDATE_ALL_MODULES
+from europa1400_manager.const import (
+    EVENT_GAME_METADATA_DETECTED,
+    EVENT_UPDATE_ALL_MODULES,
+    HashAlgorithm,
+)
 from europa1400_manager.database import Database
 from europa1400_manager.modules.base_module_gui import BaseModuleGui
 from europa1400_manager.modules.info_module import InfoModule
+from europa1400_manager.watcher import GameWatcher
 
 
 @dataclass
@@ -25,6 +31,9 @@ class InfoModuleGui(BaseModuleGui, InfoModule):
     ) -> None:
         super().__init__(config, database, event_emitter, root, notebook)
 
+        self.watcher: GameWatcher | None = None
+        self._is_memo_ignored = False
+
         # Top row with reload button
         top_frame = ttk.Frame(self.tab)
         top_frame.pack(fill="x", pady=(0, 10))
@@ -150,13 +159,39 @@ class InfoModuleGui(BaseModuleGui, InfoModule):
 
     def _on_reload_button_clicked(self) -> None:
         """Reload the game metadata."""
+        self._is_game_metadata_loaded = False
+        self._is_memo_ignored = True
+        self.event_emitter.emit(EVENT_UPDATE_ALL_MODULES)
+
+    def _on_game_files_changed(self, changed_paths: set[Path]) -> None:
+        """Refresh the modules after files were changed outside the manager."""
+        self._invalidate(changed_paths)
         self.event_emitter.emit(EVENT_UPDATE_ALL_MODULES)
 
+    async def _ensure_watcher(self) -> None:
+        """Watch the configured game path, restarting if it changed."""
+        if self.watcher is not None and self.watcher.path == self.config.game_path:
+            return
+
+        if self.watcher is not None:
+            await self.watcher.stop()
+
+        self.watcher = GameWatcher(self.config.game_path, self._on_game_files_changed)
+        await self.watcher.start()
+
     def _update_gui(self) -> None:
-        self._reload_game_metadata()
+        self.game_path_value.config(text=str(self.config.game_path))
+
+    async def _async_update_gui(self) -> None:
+        if self._is_memo_ignored:
+            self._is_memo_ignored = False
+            await self._reload_game_metadata(use_memo=False)
+        else:
+            await self._ensure_game_metadata()
+        await self._ensure_watcher()
+        self.event_emitter.emit(EVENT_GAME_METADATA_DETECTED, self.game_metadata)
 
         # Update path fields
-        self.game_path_value.config(text=str(self.config.game_path))
         self.executable_path_value.config(text=str(self._executable_path))
         self.tl_executable_path_value.config(text=str(self._tl_executable_path))
 
@@ -186,10 +221,10 @@ class InfoModuleGui(BaseModuleGui, InfoModule):
         )
 
         # Update checksum fields
-        checksums = self.checksums()
+        checksums = await self.checksums(algorithms=[HashAlgorithm.MD5], verify=False)
         self.executable_checksum_value.config(
-            text=checksums[0][1] if checksums else "N/A"
+            text=checksums[0][1][HashAlgorithm.MD5] if checksums else "N/A"
         )
         self.tl_executable_checksum_value.config(
-            text=checksums[1][1] if checksums else "N/A"
+            text=checksums[1][1][HashAlgorithm.MD5] if checksums else "N/A"
         )
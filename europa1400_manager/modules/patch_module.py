@@ -1,12 +1,14 @@
 import typer
 
 from europa1400_manager.config import Config
-from europa1400_manager.const import PatchType
+from europa1400_manager.const import AppMode, PatchType
 from europa1400_manager.database import Database
+from europa1400_manager.detection import GameDetector
+from europa1400_manager.models import GameMetadataId, GamePatch, GamePatchTable
 from europa1400_manager.modules.base_module import BaseModule
 from europa1400_manager.patches.base_patch import BasePatch
 from europa1400_manager.patches.ddrawcompat_patch import DDrawCompatPatch
-from europa1400_manager.utils import DialogUtils
+from europa1400_manager.utils import DialogUtils, MetadataUtils
 
 
 class PatchModule(BaseModule):
@@ -19,6 +21,7 @@ class PatchModule(BaseModule):
         self.patches: dict[PatchType, BasePatch] = {
             PatchType.DDRAWCOMPAT: DDrawCompatPatch(self.config),
         }
+        self.detector = GameDetector(config, database)
 
     @property
     def installed_patches(self) -> dict[PatchType, BasePatch]:
@@ -29,6 +32,37 @@ class PatchModule(BaseModule):
             if patch.is_installed
         }
 
+    async def applicable(
+        self,
+        edition: str | None = typer.Option(None, help="Edition ID to query."),
+        version: str | None = typer.Option(None, help="Version ID to query."),
+        distribution: str | None = typer.Option(None, help="Distribution ID to query."),
+        language: str | None = typer.Option(None, help="Language ID to query."),
+        drm: str | None = typer.Option(None, help="DRM ID to query."),
+    ) -> list[GamePatch]:
+        """List the patches applicable to the detected or given game metadata."""
+        overrides = GameMetadataId(
+            edition=edition,
+            version=version,
+            distribution=distribution,
+            language=language,
+            drm=drm,
+        )
+        metadata_id = overrides
+        if not any(vars(overrides).values()):
+            self.detector.game_path = self.config.game_path
+            metadata_id = MetadataUtils.to_id((await self.detector.detect()).metadata)
+
+        patches = await self._get_applicable_patches(metadata_id)
+
+        if self.config.app_mode is AppMode.CLI:
+            if not patches:
+                typer.echo("No applicable patches found.")
+            for patch in patches:
+                typer.echo(f"{patch.id}: {patch.name}")
+
+        return patches
+
     async def install(
         self, patch_name: PatchType | None = typer.Argument(default=None)
     ) -> None:
@@ -51,6 +85,30 @@ class PatchModule(BaseModule):
 
         return await self._uninstall_patch(patch_name)
 
+    async def _get_applicable_patches(
+        self, metadata_id: GameMetadataId
+    ) -> list[GamePatch]:
+        """Look up the patches applicable to the given metadata in the patch index."""
+        patch_index = await self.database.get_patch_index()
+        return patch_index.applicable_patches(metadata_id)
+
+    async def _get_relevant_patch_types(
+        self, metadata_id: GameMetadataId
+    ) -> set[PatchType]:
+        """Get the supported patches that apply to the given metadata.
+
+        Patches the database does not list are always considered relevant.
+        """
+        applicable = {
+            patch.id for patch in await self._get_applicable_patches(metadata_id)
+        }
+        return {
+            patch_type
+            for patch_type in self.patches
+            if patch_type in applicable
+            or not self.database.has_table_element(patch_type, GamePatchTable)
+        }
+
     async def _install_patch(self, patch_type: PatchType) -> None:
         """Install a specific patch."""
         patch = self.patches.get(patch_type)
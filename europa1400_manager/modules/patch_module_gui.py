@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import tkinter as tk
 from concurrent.futures import ThreadPoolExecutor
@@ -7,10 +8,16 @@ from async_tkinter_loop import async_handler
 from pyee import EventEmitter
 
 from europa1400_manager.config import Config
-from europa1400_manager.const import EVENT_UPDATE_ALL_MODULES, PatchType
+from europa1400_manager.const import (
+    EVENT_GAME_METADATA_DETECTED,
+    EVENT_UPDATE_ALL_MODULES,
+    PatchType,
+)
 from europa1400_manager.database import Database
+from europa1400_manager.models import GameMetadata
 from europa1400_manager.modules.base_module_gui import BaseModuleGui
 from europa1400_manager.modules.patch_module import PatchModule
+from europa1400_manager.utils import MetadataUtils
 
 
 class PatchModuleGui(BaseModuleGui, PatchModule):
@@ -28,6 +35,7 @@ class PatchModuleGui(BaseModuleGui, PatchModule):
         main_frame = ttk.LabelFrame(self.tab, text="Patches", padding="10")
         main_frame.pack(fill="both", expand=True, padx=5, pady=5)
 
+        self.rows: dict[PatchType, ttk.Frame] = {}
         self.status_vars: dict[PatchType, tk.BooleanVar] = {}
         self.action_buttons: dict[PatchType, ttk.Button] = {}
 
@@ -35,6 +43,7 @@ class PatchModuleGui(BaseModuleGui, PatchModule):
         for patch_type, patch in self.patches.items():
             row = ttk.Frame(main_frame)
             row.pack(fill="x", pady=2, padx=5)
+            self.rows[patch_type] = row
 
             var = tk.BooleanVar(value=patch.is_installed)
             check = ttk.Checkbutton(row, variable=var, state="disabled")
@@ -51,6 +60,10 @@ class PatchModuleGui(BaseModuleGui, PatchModule):
             action_button.pack(side="right")
             self.action_buttons[patch_type] = action_button
 
+        self.event_emitter.on(
+            EVENT_GAME_METADATA_DETECTED, self._on_game_metadata_detected
+        )
+
     @async_handler
     async def _on_action_clicked(self, patch_type: PatchType) -> None:
         patch = self.patches[patch_type]
@@ -65,6 +78,22 @@ class PatchModuleGui(BaseModuleGui, PatchModule):
 
         self.event_emitter.emit(EVENT_UPDATE_ALL_MODULES)
 
+    def _on_game_metadata_detected(self, game_metadata: GameMetadata) -> None:
+        """Show only the patches applicable to the detected game."""
+        loop = asyncio.get_event_loop()
+        loop.create_task(self._filter_rows(game_metadata))
+
+    async def _filter_rows(self, game_metadata: GameMetadata) -> None:
+        """Hide the rows of patches that do not apply to the game."""
+        relevant = await self._get_relevant_patch_types(
+            MetadataUtils.to_id(game_metadata)
+        )
+
+        for patch_type, row in self.rows.items():
+            row.pack_forget()
+            if patch_type in relevant:
+                row.pack(fill="x", pady=2, padx=5)
+
     def _update_gui(self) -> None:
         for patch_type, patch in self.patches.items():
             installed = patch.is_installed
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import fields
+from typing import TYPE_CHECKING
+
+from europa1400_manager.models import (
+    DatabaseTable,
+    GameMetadataId,
+    GameMetadataToPatch,
+    GameMetadataToPatchTable,
+    GamePatch,
+    GamePatchTable,
+)
+
+if TYPE_CHECKING:
+    from europa1400_manager.database import Database
+
+
+class PatchIndex:
+    """Reverse indexes of the metadata-to-patch mappings.
+
+    For every metadata field, mappings are indexed by the value they require,
+    and mappings that do not constrain the field are kept as wildcards. A
+    query intersects one precomputed set per field instead of scanning the
+    mappings, and answers are memoized per query.
+
+    Fields a query leaves unset do not rule out any mapping, so partially
+    detected metadata yields every patch that may apply to it.
+    """
+
+    TABLES: list[type[DatabaseTable]] = [GamePatchTable, GameMetadataToPatchTable]
+    FIELDS: tuple[str, ...] = tuple(field.name for field in fields(GameMetadataId))
+
+    def __init__(self, mappings: list[tuple[GameMetadataToPatch, GamePatch]]) -> None:
+        self.mappings = mappings
+        self._all = frozenset(range(len(mappings)))
+        self._results: dict[tuple[str | None, ...], list[GamePatch]] = {}
+
+        by_value: dict[str, dict[str, set[int]]] = {name: {} for name in self.FIELDS}
+        wildcards: dict[str, set[int]] = {name: set() for name in self.FIELDS}
+        for position, (mapping, _) in enumerate(mappings):
+            for name in self.FIELDS:
+                value = getattr(mapping.metadata, name)
+                if value is None:
+                    wildcards[name].add(position)
+                else:
+                    by_value[name].setdefault(value, set()).add(position)
+
+        self._wildcards = {
+            name: frozenset(positions) for name, positions in wildcards.items()
+        }
+        self._matching: dict[str, dict[str, frozenset[int]]] = {
+            name: {
+                value: frozenset(positions | wildcards[name])
+                for value, positions in values.items()
+            }
+            for name, values in by_value.items()
+        }
+
+    @classmethod
+    def build(cls, database: Database) -> PatchIndex:
+        """Join all metadata-to-patch mappings of a database with their patches."""
+        mappings: list[tuple[GameMetadataToPatch, GamePatch]] = []
+        for mapping in database.get_table_elements(
+            GameMetadataToPatchTable, GameMetadataToPatch
+        ):
+            try:
+                patch = database.get_table_element(
+                    mapping.patch, GamePatchTable, GamePatch
+                )
+            except ValueError as e:
+                print(
+                    f"Warning: Skipping patch mapping {mapping.id}: {e}",
+                    file=sys.stderr,
+                )
+                continue
+            mappings.append((mapping, patch))
+
+        return cls(mappings)
+
+    def applicable_patches(self, metadata_id: GameMetadataId) -> list[GamePatch]:
+        """Get the patches applicable to the given metadata, in database order."""
+        key = tuple(getattr(metadata_id, name) for name in self.FIELDS)
+        if (patches := self._results.get(key)) is not None:
+            return patches
+
+        matches = self._all
+        for name, value in zip(self.FIELDS, key):
+            if value is None:
+                continue
+            matches &= self._matching[name].get(value, self._wildcards[name])
+            if not matches:
+                break
+
+        patches = []
+        seen: set[str] = set()
+        for position in sorted(matches):
+            patch = self.mappings[position][1]
+            if patch.id not in seen:
+                seen.add(patch.id)
+                patches.append(patch)
+
+        self._results[key] = patches
+        return patches
@@ -4,8 +4,6 @@ import tempfile
 import zipfile
 from pathlib import Path
 
-import aiohttp
-
 from europa1400_manager.config import Config
 from europa1400_manager.patches.base_patch import BasePatch
 
@@ -31,6 +29,8 @@ class DDrawCompatPatch(BasePatch):
 
     async def install(self) -> None:
         """Download and install DDrawCompat."""
+        import aiohttp
+
         url = "https://github.com/narzoul/DDrawCompat/releases/download/v0.6.0/DDrawCompat-v0.6.0.zip"
 
         with tempfile.TemporaryDirectory() as tmp:
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+
+@dataclass
+class ProfileSpan:
+    """Wall-clock and CPU time of one phase, with its nested phases.
+
+    CPU time is measured for the thread the span ran in, so a span that
+    awaits also counts the CPU time of other tasks on the event loop.
+    """
+
+    name: str
+    start: float = field(default_factory=time.perf_counter)
+    cpu_start: float = field(default_factory=time.thread_time)
+    end: float | None = None
+    cpu_end: float | None = None
+    thread_id: int = field(default_factory=threading.get_ident)
+    children: list[ProfileSpan] = field(default_factory=list)
+
+    @property
+    def wall_time(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def cpu_time(self) -> float:
+        if self.cpu_end is None:
+            return time.thread_time() - self.cpu_start
+        return self.cpu_end - self.cpu_start
+
+    def finish(self) -> None:
+        self.end = time.perf_counter()
+        self.cpu_end = time.thread_time()
+
+
+class Profiler:
+    """Records the startup phases of the manager as a tree of spans.
+
+    Profiling is off until :meth:`start` is called, and :meth:`span` is a
+    no-op until then. Spans nest along the current context, so phases that
+    run in tasks or worker threads are attributed to the phase that
+    started them.
+    """
+
+    _root: ProfileSpan | None = None
+    _current: contextvars.ContextVar[ProfileSpan | None] = contextvars.ContextVar(
+        "profile_span", default=None
+    )
+
+    @classmethod
+    def start(cls) -> None:
+        """Start profiling in the current context."""
+        cls._root = ProfileSpan("total")
+        cls._current.set(cls._root)
+
+    @classmethod
+    @contextlib.contextmanager
+    def span(cls, name: str) -> Iterator[None]:
+        """Record the enclosed code as a phase of the current span."""
+        if cls._root is None:
+            yield
+            return
+
+        parent = cls._current.get() or cls._root
+        if parent.end is not None:
+            yield
+            return
+
+        span = ProfileSpan(name)
+        parent.children.append(span)
+        token = cls._current.set(span)
+        try:
+            yield
+        finally:
+            span.finish()
+            cls._current.reset(token)
+
+    @classmethod
+    def stop(cls) -> ProfileSpan | None:
+        """Stop profiling and return the finished root span."""
+        root, cls._root = cls._root, None
+        if root is not None:
+            root.finish()
+        return root
+
+    @staticmethod
+    def pop_args(args: list[str]) -> tuple[bool, Path | None]:
+        """Remove the profiling flags from a command line.
+
+        Returns whether ``--profile`` was given and the file passed to
+        ``--profile-trace``, which implies ``--profile``.
+        """
+        profile = False
+        trace_path: Path | None = None
+        index = 1
+        while index < len(args):
+            arg = args[index]
+            if arg == "--profile":
+                profile = True
+                del args[index]
+            elif arg == "--profile-trace" and index + 1 < len(args):
+                profile = True
+                trace_path = Path(args[index + 1])
+                del args[index : index + 2]
+            elif arg.startswith("--profile-trace="):
+                profile = True
+                trace_path = Path(arg.partition("=")[2])
+                del args[index]
+            else:
+                index += 1
+        return profile, trace_path
+
+    @classmethod
+    def report(cls, trace_path: Path | None = None) -> None:
+        """Stop profiling, print the phase tree and optionally write a trace."""
+        root = cls.stop()
+        if root is None:
+            return
+
+        print(cls.format_tree(root), file=sys.stderr)
+        if trace_path is not None:
+            cls.write_chrome_trace(root, trace_path)
+            print(f"Wrote trace to {trace_path}.", file=sys.stderr)
+
+    @staticmethod
+    def format_tree(root: ProfileSpan) -> str:
+        """Format a span tree with the wall-clock and CPU time of every phase."""
+        lines = [f"{'Phase':<52} {'Wall':>10} {'CPU':>10}"]
+
+        def add(span: ProfileSpan, prefix: str, child_prefix: str) -> None:
+            label = f"{prefix}{span.name}"
+            lines.append(
+                f"{label[:52]:<52} "
+                f"{span.wall_time * 1000:>7.1f} ms {span.cpu_time * 1000:>7.1f} ms"
+            )
+            children = sorted(span.children, key=lambda child: child.start)
+            for index, child in enumerate(children):
+                last = index == len(children) - 1
+                add(
+                    child,
+                    child_prefix + ("└─ " if last else "├─ "),
+                    child_prefix + ("   " if last else "│  "),
+                )
+
+        add(root, "", "")
+        return "\n".join(lines)
+
+    @staticmethod
+    def to_chrome_trace(root: ProfileSpan) -> dict[str, Any]:
+        """Convert a span tree to the Chrome trace event format."""
+        events: list[dict[str, Any]] = []
+        spans = [root]
+        while spans:
+            span = spans.pop()
+            events.append(
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "ts": (span.start - root.start) * 1e6,
+                    "dur": span.wall_time * 1e6,
+                    "pid": os.getpid(),
+                    "tid": span.thread_id,
+                    "args": {"cpu_ms": round(span.cpu_time * 1000, 3)},
+                }
+            )
+            spans.extend(span.children)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    @classmethod
+    def write_chrome_trace(cls, root: ProfileSpan, path: Path) -> None:
+        path.write_text(json.dumps(cls.to_chrome_trace(root)))
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING
+
+from europa1400_manager.const import ResolutionPolicy
+from europa1400_manager.models import GameExecutable, GameMetadata
+
+if TYPE_CHECKING:
+    from europa1400_manager.detection import DetectionCandidate
+
+
+@dataclass
+class Resolution:
+    """Metadata merged from ranked candidates, with an explanation trace."""
+
+    metadata: GameMetadata = field(default_factory=GameMetadata)
+    executable: GameExecutable | None = None
+    trace: list[str] = field(default_factory=list)
+
+
+class MetadataResolver:
+    """Merges matching detection candidates according to a resolution policy.
+
+    Candidates are ranked once, and every metadata field is then taken from
+    the highest-ranked candidate that sets it, so no prompts are needed.
+    """
+
+    FIELDS: tuple[str, ...] = tuple(field.name for field in fields(GameMetadata))
+
+    def __init__(self, policy: ResolutionPolicy) -> None:
+        if policy is ResolutionPolicy.INTERACTIVE:
+            raise ValueError("The interactive policy cannot be resolved unattended.")
+        self.policy = policy
+
+    def resolve(
+        self,
+        candidates: list[DetectionCandidate],
+        hash_candidate: DetectionCandidate | None = None,
+    ) -> Resolution:
+        """Merge the candidates whose files exist in the order of their ranking."""
+        resolution = Resolution()
+        ranked = self._rank(candidates, hash_candidate, resolution.trace)
+
+        for rank, candidate in enumerate(ranked, start=1):
+            resolution.trace.append(
+                f"#{rank} {candidate.mapping.id} "
+                f"({self._specificity(candidate)} fields set)"
+            )
+
+        for name in self.FIELDS:
+            chosen: DetectionCandidate | None = None
+            for candidate in ranked:
+                value = getattr(candidate.metadata, name)
+                if value is None:
+                    continue
+                if chosen is None:
+                    chosen = candidate
+                    setattr(resolution.metadata, name, value)
+                    resolution.trace.append(
+                        f"{name} = {value.id} from {candidate.mapping.id}"
+                    )
+                elif value != getattr(chosen.metadata, name):
+                    resolution.trace.append(
+                        f"  ignored {name} = {value.id} from {candidate.mapping.id}"
+                    )
+
+        if ranked:
+            resolution.executable = ranked[0].executable
+        else:
+            resolution.trace.append("No candidate matched the game directory.")
+
+        return resolution
+
+    def _rank(
+        self,
+        candidates: list[DetectionCandidate],
+        hash_candidate: DetectionCandidate | None,
+        trace: list[str],
+    ) -> list[DetectionCandidate]:
+        """Order the candidates by the precedence the policy gives them."""
+        trace.append(f"Policy: {self.policy}")
+
+        if self.policy is ResolutionPolicy.FIRST_WINS:
+            return candidates + ([hash_candidate] if hash_candidate else [])
+
+        if self.policy is ResolutionPolicy.MOST_SPECIFIC:
+            return sorted(
+                candidates + ([hash_candidate] if hash_candidate else []),
+                key=self._specificity,
+                reverse=True,
+            )
+
+        by_specificity = sorted(candidates, key=self._specificity, reverse=True)
+
+        if hash_candidate is None:
+            trace.append("No executable hash matched; ranking by specificity.")
+            return by_specificity
+
+        trace.append(f"Executable hash matched {hash_candidate.mapping.id}.")
+        confirmed = [hash_candidate]
+        for candidate in by_specificity:
+            conflict = self._find_conflict(hash_candidate, candidate)
+            if conflict is None:
+                confirmed.append(candidate)
+            else:
+                trace.append(
+                    f"Dropped {candidate.mapping.id}: {conflict} contradicts the hash"
+                )
+        return confirmed
+
+    @classmethod
+    def _find_conflict(
+        cls, reference: DetectionCandidate, candidate: DetectionCandidate
+    ) -> str | None:
+        """Get the first field both candidates set to different values."""
+        for name in cls.FIELDS:
+            value = getattr(candidate.metadata, name)
+            reference_value = getattr(reference.metadata, name)
+            if None not in (value, reference_value) and value != reference_value:
+                return name
+        return None
+
+    @classmethod
+    def _specificity(cls, candidate: DetectionCandidate) -> int:
+        """Count the metadata fields a candidate sets."""
+        return sum(getattr(candidate.metadata, name) is not None for name in cls.FIELDS)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from europa1400_manager.checksum_cache import ChecksumCache
+from europa1400_manager.const import HashAlgorithm, ResolutionPolicy
+from europa1400_manager.detection import GameDetector
+from europa1400_manager.detection_memo import DetectionMemo
+from europa1400_manager.hashing import FileHasher
+from europa1400_manager.models import GameExecutable
+from europa1400_manager.profiler import Profiler
+from europa1400_manager.utils import MetadataUtils
+
+if TYPE_CHECKING:
+    from europa1400_manager.config import Config
+    from europa1400_manager.database import Database
+
+
+@dataclass
+class ScanResult:
+    """Detection result of one game installation found by a scan."""
+
+    path: Path
+    executable: str | None = None
+    metadata: dict[str, str | None] = field(default_factory=dict)
+    checksums: dict[str, dict[str, str]] = field(default_factory=dict)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "path": str(self.path),
+            "executable": self.executable,
+            "metadata": self.metadata,
+        }
+        if self.checksums:
+            result["checksums"] = self.checksums
+        if self.error is not None:
+            result["error"] = self.error
+        return result
+
+
+class InstallScanner:
+    """Finds and detects all game installations below a directory.
+
+    Directories are listed with bounded parallelism. An installation is found
+    when a directory contains the main file of a known executable, and it is
+    detected while the crawl continues, so results arrive as they are ready.
+    The checksum cache and the detection memo are saved once at the end
+    rather than after every installation.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        database: Database,
+        checksum_cache: ChecksumCache,
+        concurrency: int = 8,
+        policy: ResolutionPolicy = ResolutionPolicy.HASH_CONFIRMED,
+        algorithms: list[HashAlgorithm] | None = None,
+    ) -> None:
+        self.config = config
+        self.database = database
+        self.checksum_cache = checksum_cache
+        self.policy = policy
+        self.algorithms = algorithms or []
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._memo = DetectionMemo.open(
+            config.config_file_path.parent / DetectionMemo.FILE_NAME
+        )
+
+    async def scan(self, root: Path) -> AsyncIterator[ScanResult]:
+        """Yield a result for every installation below ``root``."""
+        detection_index = await self.database.get_detection_index()
+        executables = {
+            executable.id: executable
+            for executable in (
+                [candidate.executable for candidate in detection_index.candidates]
+                + list(detection_index.hashed_executables.values())
+            )
+        }
+        by_name: dict[str, list[GameExecutable]] = {}
+        for executable in executables.values():
+            name = os.path.normcase(PurePath(executable.path).name)
+            by_name.setdefault(name, []).append(executable)
+
+        results: asyncio.Queue[ScanResult | None] = asyncio.Queue()
+        found: set[Path] = set()
+        tasks: set[asyncio.Task[None]] = set()
+
+        def start(coroutine: Any) -> None:
+            task = asyncio.create_task(coroutine)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            task.add_done_callback(lambda _: self._notify_if_done(tasks, results))
+
+        async def crawl(directory: Path) -> None:
+            async with self._semaphore:
+                names = await asyncio.to_thread(self._list_directory, directory)
+
+            for name, is_directory in names:
+                if is_directory:
+                    start(crawl(directory / name))
+                    continue
+
+                for executable in by_name.get(os.path.normcase(name), []):
+                    install_path = self._get_install_path(directory, executable)
+                    if install_path is not None and install_path not in found:
+                        found.add(install_path)
+                        start(detect(install_path))
+
+        async def detect(install_path: Path) -> None:
+            async with self._semaphore:
+                await results.put(await self._detect(install_path))
+
+        start(crawl(root))
+        try:
+            while (result := await results.get()) is not None:
+                yield result
+        finally:
+            self.checksum_cache.save()
+            self._memo.save()
+
+    @staticmethod
+    def _notify_if_done(
+        tasks: set[asyncio.Task[None]], results: asyncio.Queue[ScanResult | None]
+    ) -> None:
+        """End the result stream once the last crawl or detection finished."""
+        if not tasks:
+            results.put_nowait(None)
+
+    async def _detect(self, install_path: Path) -> ScanResult:
+        """Detect one installation and optionally hash its executables."""
+        detector = GameDetector(
+            self.config,
+            self.database,
+            self.checksum_cache,
+            game_path=install_path,
+            memo=self._memo,
+            autosave=False,
+        )
+        result = ScanResult(install_path)
+
+        try:
+            detection = await detector.detect(self.policy)
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        result.metadata = vars(MetadataUtils.to_id(detection.metadata))
+        if detection.executable is None:
+            return result
+
+        result.executable = detection.executable.id
+        if self.algorithms:
+            with Profiler.span("hashing"):
+                result.checksums = await asyncio.to_thread(
+                    self._hash_executable, install_path, detection.executable
+                )
+        return result
+
+    def _hash_executable(
+        self, install_path: Path, executable: GameExecutable
+    ) -> dict[str, dict[str, str]]:
+        """Hash both files of an executable through the checksum cache."""
+        hasher = FileHasher()
+        checksums: dict[str, dict[str, str]] = {}
+        for path in (executable.path, executable.tl_path):
+            try:
+                file_checksums = self.checksum_cache.get_checksums(
+                    install_path / path, self.algorithms, hasher
+                )
+            except OSError:
+                continue
+            checksums[path] = {
+                str(algorithm): checksum
+                for algorithm, checksum in file_checksums.items()
+            }
+        return checksums
+
+    @staticmethod
+    def _get_install_path(directory: Path, executable: GameExecutable) -> Path | None:
+        """Get the installation a file in ``directory`` belongs to, if any."""
+        parents = PurePath(executable.path).parent.parts
+        if not parents:
+            return directory
+
+        directory_parts = directory.parts
+        if len(directory_parts) <= len(parents) or [
+            os.path.normcase(part) for part in directory_parts[-len(parents) :]
+        ] != [os.path.normcase(part) for part in parents]:
+            return None
+        return Path(*directory_parts[: -len(parents)])
+
+    @staticmethod
+    def _list_directory(directory: Path) -> list[tuple[str, bool]]:
+        """List the entry names of a directory and whether they are directories."""
+        try:
+            with os.scandir(directory) as entries:
+                return [
+                    (entry.name, entry.is_dir(follow_symlinks=False))
+                    for entry in entries
+                ]
+        except OSError:
+            return []
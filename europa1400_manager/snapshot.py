@@ -0,0 +1,149 @@
+import dataclasses
+import functools
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, get_type_hints
+
+from dataclass_wizard import fromdict
+
+from europa1400_manager import models
+from europa1400_manager.models import DatabaseTable
+
+
+class DatabaseSnapshot:
+    """Compiled snapshot of parsed database tables.
+
+    The snapshot file starts with a magic number, the format version, a hash
+    of the model schema and a SHA-256 checksum of the payload. The payload is
+    plain JSON data, from which tables are rebuilt on first use, so a
+    tampered snapshot can at worst yield wrong tables but never run code.
+    Each table is stored together with the SHA-256 hash of the raw file it
+    was parsed from, so a table is only reused while its source file is
+    unchanged.
+    """
+
+    MAGIC = b"E14MSNAP"
+    VERSION = 2
+    HEADER = struct.Struct(">8sI32s32s")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tables: dict[str, tuple[str, dict[str, Any]]] | None = None
+        self._is_dirty = False
+
+    @staticmethod
+    def hash_content(data: bytes) -> str:
+        """Hash the raw contents of a database file."""
+        return hashlib.sha256(data).hexdigest()
+
+    def get(
+        self, table_type: type[DatabaseTable], content_hash: str
+    ) -> DatabaseTable | None:
+        """Return the parsed table if it was compiled from the same content."""
+        entry = self._get_tables().get(table_type.FILE_NAME)
+        if entry is None or entry[0] != content_hash:
+            return None
+
+        try:
+            return fromdict(table_type, entry[1])
+        except Exception:
+            return None
+
+    def put(
+        self, table_type: type[DatabaseTable], content_hash: str, table: DatabaseTable
+    ) -> None:
+        """Add a freshly parsed table to the snapshot."""
+        self._get_tables()[table_type.FILE_NAME] = (
+            content_hash,
+            dataclasses.asdict(table),
+        )
+        self._is_dirty = True
+
+    def save(self) -> None:
+        """Write the snapshot to disk if tables were added since it was read."""
+        if not self._is_dirty or self._tables is None:
+            return
+
+        payload = json.dumps(
+            {
+                file_name: {"content_hash": content_hash, "table": table}
+                for file_name, (content_hash, table) in self._tables.items()
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        header = self.HEADER.pack(
+            self.MAGIC,
+            self.VERSION,
+            self._schema_hash(),
+            hashlib.sha256(payload).digest(),
+        )
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_bytes(header + payload)
+        os.replace(tmp_path, self.path)
+        self._is_dirty = False
+
+    def clear(self) -> None:
+        """Delete the snapshot file and forget all compiled tables."""
+        self.path.unlink(missing_ok=True)
+        self._tables = {}
+        self._is_dirty = False
+
+    @property
+    def table_count(self) -> int:
+        """The number of tables stored in the snapshot."""
+        return len(self._get_tables())
+
+    def _get_tables(self) -> dict[str, tuple[str, dict[str, Any]]]:
+        if self._tables is None:
+            self._tables = self._read()
+        return self._tables
+
+    def _read(self) -> dict[str, tuple[str, dict[str, Any]]]:
+        """Read the snapshot, discarding it if it is outdated or damaged."""
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            return {}
+
+        if len(data) < self.HEADER.size:
+            return {}
+
+        magic, version, schema_hash, checksum = self.HEADER.unpack_from(data)
+        payload = memoryview(data)[self.HEADER.size :]
+        if (
+            magic != self.MAGIC
+            or version != self.VERSION
+            or schema_hash != self._schema_hash()
+            or hashlib.sha256(payload).digest() != checksum
+        ):
+            return {}
+
+        try:
+            entries = json.loads(payload.tobytes())
+            return {
+                file_name: (entry["content_hash"], entry["table"])
+                for file_name, entry in entries.items()
+                if isinstance(entry["content_hash"], str)
+                and isinstance(entry["table"], dict)
+            }
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return {}
+
+    @staticmethod
+    @functools.cache
+    def _schema_hash() -> bytes:
+        """Hash the fields of all models, so model changes invalidate snapshots."""
+        schema = sorted(
+            (
+                name,
+                sorted((key, str(hint)) for key, hint in get_type_hints(cls).items()),
+            )
+            for name, cls in vars(models).items()
+            if isinstance(cls, type) and dataclasses.is_dataclass(cls)
+        )
+        return hashlib.sha256(repr(schema).encode("utf-8")).digest()
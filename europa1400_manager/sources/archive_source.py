@@ -0,0 +1,82 @@
+import asyncio
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import IO
+
+from europa1400_manager.sources.base_source import BaseDatabaseSource
+
+
+class ArchiveDatabaseSource(BaseDatabaseSource):
+    """Reads database files from a tarball or zip of the database repository."""
+
+    ZIP_MAGIC = b"PK\x03\x04"
+
+    def __init__(self, path: Path, files_base_path: str) -> None:
+        self.path = path
+        self.files_base_path = files_base_path
+        self._files: dict[str, bytes] | None = None
+        self._lock = asyncio.Lock()
+
+    async def read_file(self, file_name: str) -> bytes:
+        files = await self._get_files()
+        if file_name not in files:
+            raise FileNotFoundError(
+                f"{self.files_base_path}/{file_name} not found in {self.path}"
+            )
+        return files[file_name]
+
+    async def _get_files(self) -> dict[str, bytes]:
+        """Extract all database files from the archive once."""
+        async with self._lock:
+            if self._files is None:
+                self._files = await asyncio.to_thread(self._read_path)
+            return self._files
+
+    def _read_path(self) -> dict[str, bytes]:
+        with self.path.open("rb") as archive_file:
+            return self.read_archive(archive_file, self.files_base_path)
+
+    @classmethod
+    def read_archive(
+        cls, archive_file: IO[bytes], files_base_path: str
+    ) -> dict[str, bytes]:
+        """Read the database files of a tar or zip archive into memory.
+
+        Archives of a repository usually wrap everything in a top-level
+        directory, so files are matched by their trailing path components.
+        Tar archives are read as a stream, so ``archive_file`` only needs to
+        be seekable for zip archives.
+        """
+        base_parts = PurePosixPath(files_base_path).parts
+        files: dict[str, bytes] = {}
+
+        def matches(member_name: str) -> str | None:
+            parts = PurePosixPath(member_name).parts
+            if len(parts) <= len(base_parts):
+                return None
+            if parts[-len(base_parts) - 1 : -1] != base_parts:
+                return None
+            return parts[-1]
+
+        if archive_file.seekable():
+            is_zip = archive_file.read(len(cls.ZIP_MAGIC)) == cls.ZIP_MAGIC
+            archive_file.seek(0)
+        else:
+            is_zip = False
+
+        if is_zip:
+            with zipfile.ZipFile(archive_file) as zip_archive:
+                for info in zip_archive.infolist():
+                    if info.is_dir() or (file_name := matches(info.filename)) is None:
+                        continue
+                    files.setdefault(file_name, zip_archive.read(info))
+            return files
+
+        with tarfile.open(fileobj=archive_file, mode="r|*") as tar_archive:
+            for member in tar_archive:
+                if not member.isfile() or (file_name := matches(member.name)) is None:
+                    continue
+                if (extracted := tar_archive.extractfile(member)) is not None:
+                    files.setdefault(file_name, extracted.read())
+        return files
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from types import TracebackType
+
+
+class BaseDatabaseSource(ABC):
+    """Base class for the locations database files can be read from."""
+
+    #: Whether the source applies the fetch timeout itself. Sources that
+    #: fetch all files at once do so, since a timeout per file would cover
+    #: the shared fetch many times over.
+    HANDLES_TIMEOUT = False
+
+    @abstractmethod
+    async def read_file(self, file_name: str) -> bytes:
+        """Read the raw contents of a database file."""
+
+    async def close(self) -> None:
+        """Release resources held by the source."""
+
+    async def __aenter__(self) -> "BaseDatabaseSource":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
@@ -0,0 +1,21 @@
+import asyncio
+from pathlib import Path
+
+from europa1400_manager.sources.base_source import BaseDatabaseSource
+
+
+class DirectoryDatabaseSource(BaseDatabaseSource):
+    """Reads database files from a local checkout of the database repository."""
+
+    def __init__(self, path: Path, files_base_path: str) -> None:
+        self.path = path
+        self.files_base_path = files_base_path
+
+    @property
+    def files_path(self) -> Path:
+        """The directory containing the database files."""
+        files_path = self.path / self.files_base_path
+        return files_path if files_path.is_dir() else self.path
+
+    async def read_file(self, file_name: str) -> bytes:
+        return await asyncio.to_thread((self.files_path / file_name).read_bytes)
@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import io
+import queue
+from collections.abc import Buffer
+
+import aiohttp
+from yarl import URL
+
+from europa1400_manager.cache import CacheEntryMetadata, DatabaseCache
+from europa1400_manager.sources.archive_source import ArchiveDatabaseSource
+from europa1400_manager.sources.base_source import BaseDatabaseSource
+from europa1400_manager.utils import DatabaseUtils
+
+
+class _ChunkStream(io.RawIOBase):
+    """Blocking file-like view of chunks fed from the event loop."""
+
+    def __init__(self) -> None:
+        self._chunks: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+        self._buffer = memoryview(b"")
+        self._is_eof = False
+
+    def feed(self, chunk: bytes) -> None:
+        if chunk:
+            self._chunks.put(chunk)
+
+    def feed_eof(self) -> None:
+        self._chunks.put(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        while not self._buffer:
+            if self._is_eof:
+                return 0
+            chunk = self._chunks.get()
+            if not chunk:
+                self._is_eof = True
+                return 0
+            self._buffer = memoryview(chunk)
+
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class HttpArchiveDatabaseSource(BaseDatabaseSource):
+    """Reads database files from one compressed archive of the repository.
+
+    Tarballs are decompressed while they are downloaded, without temporary
+    files. Zip archives need random access and are read once fully received.
+    The download runs in its own task under a single ``timeout``, so a reader
+    that gives up does not cancel it for the others.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    HANDLES_TIMEOUT = True
+
+    def __init__(
+        self,
+        url: URL,
+        files_base_path: str,
+        cache: DatabaseCache | None = None,
+        concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.url = url
+        self.files_base_path = files_base_path
+        self.cache = cache
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._files_task: asyncio.Task[dict[str, bytes]] | None = None
+
+    async def read_file(self, file_name: str) -> bytes:
+        files = await self._get_files()
+        if file_name not in files:
+            raise FileNotFoundError(
+                f"{self.files_base_path}/{file_name} not found in {self.url}"
+            )
+        return files[file_name]
+
+    async def close(self) -> None:
+        if self._files_task is not None and not self._files_task.done():
+            self._files_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._files_task
+
+    async def _get_files(self) -> dict[str, bytes]:
+        """Download and extract the archive once, shared by all readers."""
+        if self._files_task is None:
+            self._files_task = asyncio.create_task(self._fetch_files())
+        return await asyncio.shield(self._files_task)
+
+    async def _fetch_files(self) -> dict[str, bytes]:
+        async with asyncio.timeout(self.timeout):
+            async with DatabaseUtils.create_session(self.concurrency) as session:
+                return await self._download(session)
+
+    async def _download(self, session: aiohttp.ClientSession) -> dict[str, bytes]:
+        cache_file_name = f"archive-{self.url.name}"
+        entry = (
+            self.cache.read(cache_file_name, str(self.url))
+            if self.cache is not None
+            else None
+        )
+        if self.cache is not None and entry is not None and self.cache.is_fresh(entry):
+            return await self._extract(entry.data)
+
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.metadata.etag:
+                headers["If-None-Match"] = entry.metadata.etag
+            if entry.metadata.last_modified:
+                headers["If-Modified-Since"] = entry.metadata.last_modified
+
+        async with session.get(str(self.url), headers=headers) as response:
+            if self.cache is not None and entry is not None and response.status == 304:
+                self.cache.touch(entry)
+                return await self._extract(entry.data)
+
+            response.raise_for_status()
+
+            if self.url.name.endswith(".zip"):
+                data = await response.read()
+                files = await self._extract(data)
+            else:
+                data, files = await self._stream_extract(response)
+
+            if self.cache is not None:
+                self.cache.write(
+                    cache_file_name,
+                    data,
+                    CacheEntryMetadata(
+                        url=str(self.url),
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    ),
+                )
+
+        return files
+
+    async def _extract(self, data: bytes) -> dict[str, bytes]:
+        return await asyncio.to_thread(
+            ArchiveDatabaseSource.read_archive, io.BytesIO(data), self.files_base_path
+        )
+
+    async def _stream_extract(
+        self, response: aiohttp.ClientResponse
+    ) -> tuple[bytes, dict[str, bytes]]:
+        """Decompress a tarball in a worker thread while it is being received."""
+        stream = _ChunkStream()
+        extraction = asyncio.create_task(
+            asyncio.to_thread(
+                ArchiveDatabaseSource.read_archive,
+                io.BufferedReader(stream),
+                self.files_base_path,
+            )
+        )
+
+        chunks: list[bytes] = []
+        try:
+            async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                chunks.append(chunk)
+                stream.feed(chunk)
+        except BaseException:
+            stream.feed_eof()
+            with contextlib.suppress(Exception):
+                await extraction
+            raise
+
+        stream.feed_eof()
+        return b"".join(chunks), await extraction
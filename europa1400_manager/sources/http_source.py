@@ -0,0 +1,87 @@
+import asyncio
+import sys
+
+import aiohttp
+from yarl import URL
+
+from europa1400_manager.cache import DatabaseCache
+from europa1400_manager.models import DatabaseManifest, DatabaseManifestFile
+from europa1400_manager.sources.base_source import BaseDatabaseSource
+from europa1400_manager.utils import DatabaseUtils
+
+
+class HttpDatabaseSource(BaseDatabaseSource):
+    """Reads database files from a raw HTTP repository layout.
+
+    If the repository provides a manifest, it is fetched once and only files
+    whose cached copy no longer matches their manifest hash are downloaded.
+    """
+
+    def __init__(
+        self,
+        base_url: URL,
+        cache: DatabaseCache | None = None,
+        concurrency: int | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.cache = cache
+        self.concurrency = concurrency
+        self._session: aiohttp.ClientSession | None = None
+        self._manifest: dict[str, DatabaseManifestFile] | None = None
+        self._manifest_lock = asyncio.Lock()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session shared by all requests of this source."""
+        if self._session is None or self._session.closed:
+            self._session = DatabaseUtils.create_session(self.concurrency)
+        return self._session
+
+    async def read_file(self, file_name: str) -> bytes:
+        url = self.base_url / file_name
+
+        # A copy within the cache max age is used as is, so the manifest is
+        # only needed for files that would be revalidated anyway.
+        manifest_file: DatabaseManifestFile | None = None
+        if self.cache is None or self.cache.read_fresh(file_name, str(url)) is None:
+            manifest_file = (await self.get_manifest()).get(file_name)
+
+        return await DatabaseUtils.fetch_file(
+            self.session, url, file_name, self.cache, manifest_file
+        )
+
+    async def get_manifest(self) -> dict[str, DatabaseManifestFile]:
+        """Fetch the manifest once, returning no entries if there is none.
+
+        A missing manifest is cached like any other file, so repositories
+        without one are not asked for it again while the cache is fresh.
+        """
+        async with self._manifest_lock:
+            if self._manifest is None:
+                self._manifest = await self._fetch_manifest()
+            return self._manifest
+
+    async def _fetch_manifest(self) -> dict[str, DatabaseManifestFile]:
+        try:
+            data = await DatabaseUtils.fetch_file(
+                self.session,
+                self.base_url / DatabaseManifest.FILE_NAME,
+                DatabaseManifest.FILE_NAME,
+                self.cache,
+            )
+            manifest = DatabaseManifest.from_yaml(data.decode("utf-8"))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Warning: Failed to fetch database manifest: {e}", file=sys.stderr)
+            return {}
+
+        if not isinstance(manifest, DatabaseManifest):
+            return {}
+
+        return {file.name: file for file in manifest.files}
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,68 @@
+import contextlib
+import contextvars
+import sys
+from typing import Iterator, TextIO, cast
+
+_context_streams: contextvars.ContextVar[dict[str, TextIO] | None] = (
+    contextvars.ContextVar("context_streams", default=None)
+)
+
+
+class ContextStream:
+    """A standard stream that follows the streams set for the current context.
+
+    Outside of such a context, it behaves like the stream it replaced.
+    """
+
+    def __init__(self, name: str, fallback: TextIO) -> None:
+        self.name = name
+        self.fallback = fallback
+
+    @property
+    def target(self) -> TextIO:
+        streams = _context_streams.get()
+        return self.fallback if streams is None else streams[self.name]
+
+    @property
+    def encoding(self) -> str:
+        return self.target.encoding or "utf-8"
+
+    def write(self, text: str) -> int:
+        return self.target.write(text)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def read(self, size: int = -1) -> str:
+        return self.target.read(size)
+
+    def readline(self, size: int = -1) -> str:
+        return self.target.readline(size)
+
+    def isatty(self) -> bool:
+        return self.target.isatty()
+
+    def fileno(self) -> int:
+        return self.target.fileno()
+
+
+@contextlib.contextmanager
+def install_context_streams() -> Iterator[None]:
+    """Replace the standard streams with context streams while active."""
+    if isinstance(sys.stdout, ContextStream):
+        yield
+        return
+
+    streams = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin = cast(TextIO, ContextStream("stdin", sys.stdin))
+    sys.stdout = cast(TextIO, ContextStream("stdout", sys.stdout))
+    sys.stderr = cast(TextIO, ContextStream("stderr", sys.stderr))
+    try:
+        yield
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = streams
+
+
+def set_context_streams(stdin: TextIO, stdout: TextIO, stderr: TextIO) -> None:
+    """Set the standard streams of the current context and its child tasks."""
+    _context_streams.set({"stdin": stdin, "stdout": stdout, "stderr": stderr})
@@ -1,26 +1,55 @@
+from __future__ import annotations
+
+import hashlib
 import os
 from pathlib import Path
-from tkinter import messagebox, simpledialog
-from typing import Any, TypeVar, cast
-
-import aiohttp
-import typer
-import yaml
-from dotenv import load_dotenv
-from yarl import URL
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 from europa1400_manager.const import (
+    DAEMON_ENVIRONMENT,
     DEFAULT_CONFIG_FILE_PATH,
+    DEFAULT_DAEMON_SOCKET_PATH,
+    DEFAULT_DATABASE_ARCHIVE_URL,
+    DEFAULT_DATABASE_CACHE_MAX_AGE,
+    DEFAULT_DATABASE_CACHE_PATH,
+    DEFAULT_DATABASE_FETCH_CONCURRENCY,
+    DEFAULT_DATABASE_FETCH_TIMEOUT,
     DEFAULT_DATABASE_FILES_BASE_PATH,
     DEFAULT_DATABASE_REPOSITORY_BRANCH,
     DEFAULT_DATABASE_REPOSITORY_URL,
+    DEFAULT_DATABASE_TRANSPORT,
+    DEFAULT_DETECTION_POLICY,
     ENV_CONFIG_FILE_PATH,
+    ENV_DAEMON_SOCKET_PATH,
+    ENV_DATABASE_ARCHIVE_URL,
+    ENV_DATABASE_CACHE_MAX_AGE,
+    ENV_DATABASE_CACHE_PATH,
+    ENV_DATABASE_FETCH_CONCURRENCY,
+    ENV_DATABASE_FETCH_TIMEOUT,
     ENV_DATABASE_FILES_BASE_PATH,
     ENV_DATABASE_REPOSITORY_BRANCH,
     ENV_DATABASE_REPOSITORY_URL,
+    ENV_DATABASE_TRANSPORT,
+    ENV_DETECTION_POLICY,
     AppMode,
+    DatabaseTransport,
+    ResolutionPolicy,
 )
-from europa1400_manager.models import DatabaseTable, GameMetadata
+
+# Third-party packages and models are imported in the functions using them.
+# Headless commands thus never load tkinter, and commands that neither fetch
+# nor parse anything skip aiohttp and yaml.
+if TYPE_CHECKING:
+    import aiohttp
+    from yarl import URL
+
+    from europa1400_manager.cache import DatabaseCache
+    from europa1400_manager.models import (
+        DatabaseManifestFile,
+        DatabaseTable,
+        GameMetadata,
+        GameMetadataId,
+    )
 
 
 class DialogUtils:
@@ -28,8 +57,12 @@ class DialogUtils:
     def tell(app_mode: AppMode, message: str) -> None:
         """Display a message to the user."""
         if app_mode == AppMode.GUI:
+            from tkinter import messagebox
+
             messagebox.showinfo("Information", message)
         else:
+            import typer
+
             typer.echo(message)
 
     @staticmethod
@@ -37,16 +70,22 @@ class DialogUtils:
         """Ask a question and return the answer."""
 
         if app_mode == AppMode.GUI:
+            from tkinter import simpledialog
+
             return str(
                 simpledialog.askstring("Input", prompt, initialvalue=default) or ""
             )
         else:
+            import typer
+
             return str(typer.prompt(text=prompt, default=default))
 
     @staticmethod
     def ask_yes_no(app_mode: AppMode, prompt: str, default: bool = True) -> bool:
         """Ask a yes/no question and return the answer."""
         if app_mode == AppMode.GUI:
+            from tkinter import messagebox
+
             return bool(
                 messagebox.askyesno(
                     "Question",
@@ -55,6 +94,8 @@ class DialogUtils:
                 )
             )
         else:
+            import typer
+
             return typer.confirm(text=prompt, default=default)
 
 
@@ -62,6 +103,8 @@ class EnvUtils:
     @staticmethod
     def read(name: str, default: str) -> str:
         """Get an environment variable or return a default value."""
+        from dotenv import load_dotenv
+
         load_dotenv()
 
         return os.getenv(name, default)
@@ -74,10 +117,32 @@ class EnvUtils:
     @staticmethod
     def get_database_repository_url() -> URL:
         """Get the database repository URL from environment variables."""
+        from yarl import URL
+
         return URL(
             EnvUtils.read(ENV_DATABASE_REPOSITORY_URL, DEFAULT_DATABASE_REPOSITORY_URL)
         )
 
+    @staticmethod
+    def get_database_repository_path() -> Path | None:
+        """Get the local database repository path, if one is configured.
+
+        ``DATABASE_REPOSITORY_URL`` may be a ``file://`` URL or a plain path to
+        a checked-out copy of the database repository or an archive of it.
+        """
+        value = EnvUtils.read(
+            ENV_DATABASE_REPOSITORY_URL, DEFAULT_DATABASE_REPOSITORY_URL
+        )
+        if value.startswith("file:"):
+            import urllib.request
+
+            from yarl import URL
+
+            return Path(urllib.request.url2pathname(URL(value).path))
+        if "://" in value:
+            return None
+        return Path(value)
+
     @staticmethod
     def get_database_repository_branch() -> str:
         """Get the database repository branch from environment variables."""
@@ -92,6 +157,77 @@ class EnvUtils:
             ENV_DATABASE_FILES_BASE_PATH, DEFAULT_DATABASE_FILES_BASE_PATH
         )
 
+    @staticmethod
+    def get_database_transport() -> DatabaseTransport:
+        """Get whether database files are fetched one by one or as one archive."""
+        return DatabaseTransport(
+            EnvUtils.read(ENV_DATABASE_TRANSPORT, DEFAULT_DATABASE_TRANSPORT)
+        )
+
+    @staticmethod
+    def get_detection_policy() -> ResolutionPolicy:
+        """Get how conflicting detection candidates are resolved."""
+        return ResolutionPolicy(
+            EnvUtils.read(ENV_DETECTION_POLICY, DEFAULT_DETECTION_POLICY)
+        )
+
+    @staticmethod
+    def get_daemon_socket_path() -> Path:
+        """Get the path of the socket on which the daemon serves commands."""
+        return Path(EnvUtils.read(ENV_DAEMON_SOCKET_PATH, DEFAULT_DAEMON_SOCKET_PATH))
+
+    @staticmethod
+    def get_daemon_environment() -> dict[str, str | None]:
+        """Get the variables that must match between a daemon and its clients."""
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
+        return {name: os.getenv(name) for name in DAEMON_ENVIRONMENT}
+
+    @staticmethod
+    def get_database_archive_url() -> URL:
+        """Get the URL of a compressed archive of the database repository."""
+        from yarl import URL
+
+        if url := EnvUtils.read(ENV_DATABASE_ARCHIVE_URL, ""):
+            return URL(url)
+
+        return URL(DEFAULT_DATABASE_ARCHIVE_URL) / (
+            f"{EnvUtils.get_database_repository_branch()}.tar.gz"
+        )
+
+    @staticmethod
+    def get_database_fetch_concurrency() -> int:
+        """Get the maximum number of database tables fetched at the same time."""
+        return max(
+            1,
+            int(
+                EnvUtils.read(
+                    ENV_DATABASE_FETCH_CONCURRENCY, DEFAULT_DATABASE_FETCH_CONCURRENCY
+                )
+            ),
+        )
+
+    @staticmethod
+    def get_database_fetch_timeout() -> float:
+        """Get the timeout in seconds for fetching a single database table."""
+        return float(
+            EnvUtils.read(ENV_DATABASE_FETCH_TIMEOUT, DEFAULT_DATABASE_FETCH_TIMEOUT)
+        )
+
+    @staticmethod
+    def get_database_cache_path() -> Path:
+        """Get the directory in which fetched database files are cached."""
+        return Path(EnvUtils.read(ENV_DATABASE_CACHE_PATH, DEFAULT_DATABASE_CACHE_PATH))
+
+    @staticmethod
+    def get_database_cache_max_age() -> float:
+        """Get the age in seconds up to which cached files are used unchecked."""
+        return float(
+            EnvUtils.read(ENV_DATABASE_CACHE_MAX_AGE, DEFAULT_DATABASE_CACHE_MAX_AGE)
+        )
+
 
 class PathUtils:
     @staticmethod
@@ -120,32 +256,122 @@ class PathUtils:
         return True
 
 
-TTable = TypeVar("TTable", bound=DatabaseTable)
+TTable = TypeVar("TTable", bound="DatabaseTable")
 
 
 class DatabaseUtils:
     @staticmethod
-    async def fetch_table(table_type: type[TTable]) -> TTable:
-        url = (
-            EnvUtils.get_database_repository_url()
-            / EnvUtils.get_database_repository_branch()
-            / EnvUtils.get_database_files_base_path()
-            / table_type.FILE_NAME
+    def create_session(concurrency: int | None = None) -> aiohttp.ClientSession:
+        """Create a pooled HTTP session shared by all database requests."""
+        import aiohttp
+        from aiohttp.compression_utils import HAS_BROTLI
+
+        if concurrency is None:
+            concurrency = EnvUtils.get_database_fetch_concurrency()
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        # Brotli can only be decoded if one of the Brotli packages is installed
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={"Accept-Encoding": "gzip, br" if HAS_BROTLI else "gzip"},
+        )
+
+    @staticmethod
+    def parse_table(table_type: type[TTable], data: bytes) -> TTable:
+        """Parse the raw YAML contents of a table."""
+        table = table_type.from_yaml(data.decode("utf-8"))
+        if not isinstance(table, table_type):
+            raise TypeError(
+                f"Expected instance of {table_type.__name__}, got {type(table).__name__}"
+            )
+        return table
+
+    @staticmethod
+    async def fetch_file(
+        session: aiohttp.ClientSession,
+        url: URL,
+        file_name: str,
+        cache: DatabaseCache | None = None,
+        manifest_file: DatabaseManifestFile | None = None,
+    ) -> bytes:
+        """Fetch a file, revalidating a cached copy instead of downloading it again.
+
+        If ``manifest_file`` is given, a cached copy matching its hash is used
+        without any request, and downloaded bytes are verified against it.
+        A missing file raises :class:`FileNotFoundError`, and its absence is
+        cached like a downloaded file.
+        """
+        entry = cache.read(file_name, str(url)) if cache is not None else None
+        if manifest_file is not None:
+            if entry is not None and DatabaseUtils.matches_manifest(
+                entry.data, manifest_file
+            ):
+                return entry.data
+            entry = None
+        elif cache is not None and entry is not None and cache.is_fresh(entry):
+            if entry.metadata.missing:
+                raise FileNotFoundError(f"{file_name} not found at {url}")
+            return entry.data
+
+        if entry is not None and entry.metadata.missing:
+            entry = None
+
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.metadata.etag:
+                headers["If-None-Match"] = entry.metadata.etag
+            if entry.metadata.last_modified:
+                headers["If-Modified-Since"] = entry.metadata.last_modified
+
+        async with session.get(str(url), headers=headers) as response:
+            if cache is not None and entry is not None and response.status == 304:
+                cache.touch(entry)
+                return entry.data
+
+            if response.status == 404:
+                if cache is not None:
+                    cache.write_missing(file_name, str(url))
+                raise FileNotFoundError(f"{file_name} not found at {url}")
+
+            response.raise_for_status()
+            data = await response.read()
+
+            if manifest_file is not None and not DatabaseUtils.matches_manifest(
+                data, manifest_file
+            ):
+                raise ValueError(
+                    f"{file_name} does not match the size and hash in the manifest."
+                )
+
+            if cache is not None:
+                from europa1400_manager.cache import CacheEntryMetadata
+
+                cache.write(
+                    file_name,
+                    data,
+                    CacheEntryMetadata(
+                        url=str(url),
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    ),
+                )
+
+        return data
+
+    @staticmethod
+    def matches_manifest(data: bytes, manifest_file: DatabaseManifestFile) -> bool:
+        """Check the size and hash of file contents against a manifest entry."""
+        return (
+            len(data) == manifest_file.size
+            and hashlib.sha256(data).hexdigest() == manifest_file.sha256.lower()
         )
-        async with aiohttp.ClientSession() as session:
-            async with session.get(str(url)) as response:
-                response.raise_for_status()
-                text = await response.text()
-                table = table_type.from_yaml(text)
-                if not isinstance(table, table_type):
-                    raise TypeError(
-                        f"Expected instance of {table_type.__name__}, got {type(table).__name__}"
-                    )
-                return table
 
     @staticmethod
     async def read_yaml_file(url: URL) -> dict[str, Any]:
         """Read a YAML file from a URL and return its contents."""
+        import aiohttp
+        import yaml
+
         async with aiohttp.ClientSession() as session:
             async with session.get(str(url)) as response:
                 response.raise_for_status()
@@ -178,6 +404,19 @@ class MetadataUtils:
 
         return f"{metadata.edition}_{metadata.version}_{metadata.distribution}_{metadata.language}"
 
+    @staticmethod
+    def to_id(metadata: GameMetadata) -> GameMetadataId:
+        """Convert a :class:`GameMetadata` instance to its element IDs."""
+        from europa1400_manager.models import GameMetadataId
+
+        return GameMetadataId(
+            edition=metadata.edition.id if metadata.edition else None,
+            version=metadata.version.id if metadata.version else None,
+            distribution=metadata.distribution.id if metadata.distribution else None,
+            language=metadata.language.id if metadata.language else None,
+            drm=metadata.drm.id if metadata.drm else None,
+        )
+
     @staticmethod
     def calc_changes(
         metadata: GameMetadata,
@@ -214,7 +453,11 @@ class MetadataUtils:
 
             chosen_value = self_value if self_value is not None else other_value
 
-            if self_value is not None and self_value != other_value:
+            if (
+                self_value is not None
+                and other_value is not None
+                and self_value != other_value
+            ):
                 if other_key not in [d[0] for d in decisions]:
                     raise ValueError(
                         f"Decision for attribute {other_key} not found in decisions."
@@ -0,0 +1,277 @@
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable
+
+ChangeCallback = Callable[[set[Path]], None]
+
+
+class BaseWatcherBackend(ABC):
+    """Reports changed paths below a directory to a callback."""
+
+    def __init__(self, path: Path, on_change: ChangeCallback) -> None:
+        self.path = path
+        self.on_change = on_change
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Start watching."""
+
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop watching."""
+
+
+class InotifyWatcherBackend(BaseWatcherBackend):
+    """Watches a directory tree with Linux inotify, read from the event loop."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+    )
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, path: Path, on_change: ChangeCallback) -> None:
+        super().__init__(path, on_change)
+        self._libc = self.load_libc()
+        self._fd = -1
+        self._watches: dict[int, Path] = {}
+
+    @staticmethod
+    def load_libc() -> ctypes.CDLL:
+        """Load the C library, raising :class:`OSError` if inotify is missing."""
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux.")
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("The C library does not provide inotify.")
+        return libc
+
+    async def start(self) -> None:
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        try:
+            await asyncio.to_thread(self._add_tree, self.path)
+        except OSError:
+            os.close(self._fd)
+            self._fd = -1
+            raise
+
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+
+    async def stop(self) -> None:
+        if self._fd < 0:
+            return
+
+        asyncio.get_running_loop().remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = -1
+        self._watches.clear()
+
+    def _add_tree(self, directory: Path) -> None:
+        """Watch a directory and all of its subdirectories."""
+        directories = [directory]
+        while directories:
+            current = directories.pop()
+            self._add_watch(current)
+            try:
+                with os.scandir(current) as entries:
+                    directories.extend(
+                        Path(entry.path)
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    )
+            except OSError:
+                continue
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), ctypes.c_uint32(self.MASK)
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+        self._watches[wd] = directory
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        changes: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changes.add(self.path)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_IGNORED:
+                del self._watches[wd]
+                continue
+
+            changed_path = directory / name if name else directory
+            changes.add(changed_path)
+
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                try:
+                    self._add_tree(changed_path)
+                except OSError as e:
+                    print(f"Warning: {e}", file=sys.stderr)
+
+        if changes:
+            self.on_change(changes)
+
+
+class PollingWatcherBackend(BaseWatcherBackend):
+    """Detects changes by diffing periodic stat snapshots of a directory tree."""
+
+    def __init__(
+        self, path: Path, on_change: ChangeCallback, interval: float = 2.0
+    ) -> None:
+        super().__init__(path, on_change)
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        snapshot = await asyncio.to_thread(self._take_snapshot)
+        self._task = asyncio.create_task(self._poll(snapshot))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _poll(self, snapshot: dict[Path, tuple[int, int, int]]) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            current = await asyncio.to_thread(self._take_snapshot)
+
+            changes = {
+                path
+                for path in snapshot.keys() | current.keys()
+                if snapshot.get(path) != current.get(path)
+            }
+            snapshot = current
+
+            if changes:
+                self.on_change(changes)
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int, int]]:
+        """Get the size, mtime and inode of every file below the path."""
+        snapshot: dict[Path, tuple[int, int, int]] = {}
+        directories = [self.path]
+        while directories:
+            directory = directories.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(Path(entry.path))
+                            continue
+                        stat_result = entry.stat(follow_symlinks=False)
+                        snapshot[Path(entry.path)] = (
+                            stat_result.st_size,
+                            stat_result.st_mtime_ns,
+                            stat_result.st_ino,
+                        )
+            except OSError:
+                continue
+        return snapshot
+
+
+class GameWatcher:
+    """Watches the game directory and reports batches of changed paths.
+
+    inotify is used where it is available, and a polling snapshot diff
+    otherwise. Changes arriving in quick succession, like the writes of a
+    patch installer, are coalesced into one callback.
+    """
+
+    DEBOUNCE_DELAY = 0.3
+
+    def __init__(self, path: Path, on_change: ChangeCallback) -> None:
+        self.path = path
+        self.on_change = on_change
+        self._backend: BaseWatcherBackend | None = None
+        self._pending: set[Path] = set()
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._backend is not None
+
+    async def start(self) -> None:
+        """Start watching with the best available backend."""
+        if self._backend is not None:
+            return
+
+        try:
+            backend: BaseWatcherBackend = InotifyWatcherBackend(
+                self.path, self._on_backend_change
+            )
+            await backend.start()
+        except OSError:
+            backend = PollingWatcherBackend(self.path, self._on_backend_change)
+            await backend.start()
+
+        self._backend = backend
+
+    async def stop(self) -> None:
+        """Stop watching and drop pending changes."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending.clear()
+
+        if self._backend is not None:
+            await self._backend.stop()
+            self._backend = None
+
+    def _on_backend_change(self, changes: set[Path]) -> None:
+        self._pending |= changes
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.DEBOUNCE_DELAY, self._flush
+            )
+
+    def _flush(self) -> None:
+        changes, self._pending = self._pending, set()
+        self._flush_handle = None
+        self.on_change(changes)
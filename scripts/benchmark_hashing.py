@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compare the throughput of the single-pass file hasher with hashing a file in
+4 KiB chunks once per algorithm, as the info module used to do for MD5.
+
+Run from the repository root: uv run python -m scripts.benchmark_hashing
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import timeit
+import zlib
+from pathlib import Path
+from typing import Callable
+
+from europa1400_manager.const import HashAlgorithm
+from europa1400_manager.hashing import FileHasher
+
+
+def hash_chunked(file_path: Path, algorithm: HashAlgorithm) -> str:
+    if algorithm is HashAlgorithm.CRC32:
+        value = 0
+        with file_path.open("rb") as f:
+            for chunk in iter(lambda: f.read(4096), b""):
+                value = zlib.crc32(chunk, value)
+        return f"{value:08x}"
+
+    hasher = hashlib.new(algorithm.value)
+    with file_path.open("rb") as f:
+        for chunk in iter(lambda: f.read(4096), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64, help="File size in MiB.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--algorithm",
+        dest="algorithms",
+        action="append",
+        type=HashAlgorithm,
+        choices=list(HashAlgorithm),
+    )
+    args = parser.parse_args()
+    algorithms: list[HashAlgorithm] = args.algorithms or list(HashAlgorithm)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = Path(tmp) / "game.exe"
+        file_path.write_bytes(os.urandom(args.size * 1024 * 1024))
+
+        read_hasher = FileHasher(mmap_threshold=None)
+        mmap_hasher = FileHasher(mmap_threshold=0)
+
+        expected = {
+            algorithm: hash_chunked(file_path, algorithm) for algorithm in algorithms
+        }
+        for hasher in (read_hasher, mmap_hasher):
+            if hasher.hash_file(file_path, algorithms) != expected:
+                raise RuntimeError("Hasher results differ from the reference.")
+
+        def measure(function: Callable[[], object]) -> float:
+            return min(timeit.repeat(function, number=1, repeat=args.repeat))
+
+        chunked_time = measure(
+            lambda: [hash_chunked(file_path, algorithm) for algorithm in algorithms]
+        )
+        read_time = measure(lambda: read_hasher.hash_file(file_path, algorithms))
+        mmap_time = measure(lambda: mmap_hasher.hash_file(file_path, algorithms))
+
+        print(f"File size:      {args.size} MiB")
+        print(f"Algorithms:     {', '.join(algorithms)}")
+        for label, elapsed in (
+            ("4 KiB chunks", chunked_time),
+            ("readinto", read_time),
+            ("mmap", mmap_time),
+        ):
+            print(
+                f"{label + ':':<15} {elapsed * 1000:8.2f} ms "
+                f"({args.size / elapsed:8.1f} MiB/s, "
+                f"{chunked_time / elapsed:.1f}x)"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
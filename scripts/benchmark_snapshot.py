@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare parsing a database table from YAML with loading it from a compiled
+snapshot. A synthetic executable-to-metadata table is used so the benchmark
+does not depend on network access.
+
+Run from the repository root: uv run python -m scripts.benchmark_snapshot
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from europa1400_manager.models import GameExecutableToMetadataTable
+from europa1400_manager.snapshot import DatabaseSnapshot
+from europa1400_manager.utils import DatabaseUtils
+
+
+def generate_table(element_count: int) -> bytes:
+    lines = ["id: executable_to_metadata", "name: Executable to Metadata", "elements:"]
+    for index in range(element_count):
+        lines += [
+            f"  - id: mapping_{index}",
+            f"    executable: executable_{index % 50}",
+            "    metadata:",
+            f"      edition: edition_{index % 3}",
+            f"      version: version_{index % 7}",
+            f"      distribution: distribution_{index % 4}",
+            f"      language: language_{index % 10}",
+        ]
+    return "\n".join(lines).encode("utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table_type = GameExecutableToMetadataTable
+    data = generate_table(args.elements)
+    content_hash = DatabaseSnapshot.hash_content(data)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "database.snapshot"
+
+        snapshot = DatabaseSnapshot(snapshot_path)
+        snapshot.put(
+            table_type, content_hash, DatabaseUtils.parse_table(table_type, data)
+        )
+        snapshot.save()
+
+        def parse_yaml() -> None:
+            DatabaseUtils.parse_table(table_type, data)
+
+        def load_snapshot() -> None:
+            if DatabaseSnapshot(snapshot_path).get(table_type, content_hash) is None:
+                raise RuntimeError("Snapshot did not contain the table.")
+
+        yaml_time = min(timeit.repeat(parse_yaml, number=1, repeat=args.repeat))
+        snapshot_time = min(timeit.repeat(load_snapshot, number=1, repeat=args.repeat))
+
+        print(f"Elements:       {args.elements}")
+        print(f"YAML size:      {len(data)} bytes")
+        print(f"Snapshot size:  {snapshot_path.stat().st_size} bytes")
+        print(f"YAML parse:     {yaml_time * 1000:.2f} ms")
+        print(f"Snapshot load:  {snapshot_time * 1000:.2f} ms")
+        print(f"Speedup:        {yaml_time / snapshot_time:.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
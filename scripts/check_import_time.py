@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Guard the import cost of the CLI entry points with ``python -X importtime``.
+
+Each check imports a set of modules in a fresh interpreter. It fails if any
+forbidden package is pulled in, or if the best cumulative import time of the
+modules over several runs exceeds the budget.
+
+Run from the repository root: uv run python -m scripts.check_import_time
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportCheck:
+    name: str
+    modules: list[str]
+    forbidden: list[str]
+    budget_ms: float
+
+
+CHECKS = [
+    ImportCheck(
+        name="daemon client",
+        modules=["europa1400_manager.__main__"],
+        forbidden=["tkinter", "aiohttp", "yaml", "typer", "dataclass_wizard"],
+        budget_ms=100,
+    ),
+    ImportCheck(
+        name="headless CLI",
+        modules=[
+            "europa1400_manager.cli",
+            "europa1400_manager.modules.cache_module",
+            "europa1400_manager.modules.config_module",
+            "europa1400_manager.modules.info_module",
+            "europa1400_manager.modules.license_module",
+            "europa1400_manager.modules.patch_module",
+        ],
+        forbidden=["tkinter", "aiohttp", "yaml", "async_tkinter_loop"],
+        budget_ms=500,
+    ),
+]
+
+
+def measure(modules: list[str]) -> tuple[float, set[str]]:
+    """Import modules in a fresh interpreter and return their cost and imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total_us = 0
+    imported: set[str] = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imported.add(name)
+        if len(indent) == 1 and name.startswith("europa1400_manager"):
+            total_us += int(cumulative)
+
+    return total_us / 1000, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Runs per check; the fastest counts."
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Factor applied to every budget."
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for check in CHECKS:
+        runs = [measure(check.modules) for _ in range(max(1, args.runs))]
+        elapsed = min(elapsed for elapsed, _ in runs)
+        imported = set().union(*(imported for _, imported in runs))
+        budget = check.budget_ms * args.scale
+
+        leaked = sorted(
+            package
+            for package in check.forbidden
+            if any(
+                name == package or name.startswith(f"{package}.") for name in imported
+            )
+        )
+        status = "ok" if elapsed <= budget and not leaked else "FAILED"
+        print(
+            f"{check.name + ':':<15} {elapsed:7.1f} ms (budget {budget:.0f} ms) {status}"
+        )
+
+        if elapsed > budget:
+            failed = True
+        if leaked:
+            failed = True
+            print(f"  imports forbidden modules: {', '.join(leaked)}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+import pytest
+
+from europa1400_manager.batch import BatchRunner
+
+
+def test_parse_lines() -> None:
+    text = "info show\n\npatch apply 'my patch'\n"
+
+    assert BatchRunner.parse(text) == [
+        ["info", "show"],
+        ["patch", "apply", "my patch"],
+    ]
+
+
+def test_parse_lines_skips_comments() -> None:
+    text = "# inventory\ninfo show  # current install\n   # indented\n"
+
+    assert BatchRunner.parse(text) == [["info", "show"]]
+
+
+def test_parse_json_list() -> None:
+    text = '  ["info show", ["patch", "apply", "my patch"], [1]]'
+
+    assert BatchRunner.parse(text) == [
+        ["info", "show"],
+        ["patch", "apply", "my patch"],
+        ["1"],
+    ]
+
+
+def test_parse_empty() -> None:
+    assert BatchRunner.parse("") == []
+    assert BatchRunner.parse("[]") == []
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"commands": ["info show"]}',
+        '["info show", 1]',
+        '["info show"',
+        "info show 'unclosed",
+    ],
+)
+def test_parse_invalid(text: str) -> None:
+    with pytest.raises(ValueError):
+        BatchRunner.parse(text)
@@ -0,0 +1,65 @@
+from europa1400_manager.models import GameMetadataId, GameMetadataToPatch, GamePatch
+from europa1400_manager.patch_index import PatchIndex
+
+GOLD = GamePatch("gold", "Gold patch")
+GOLD_STEAM = GamePatch("gold-steam", "Gold Steam patch")
+ANY = GamePatch("any", "Patch for every edition")
+
+
+def create_index() -> PatchIndex:
+    return PatchIndex(
+        [
+            (GameMetadataToPatch("1", GameMetadataId(edition="gold"), "gold"), GOLD),
+            (
+                GameMetadataToPatch(
+                    "2",
+                    GameMetadataId(edition="gold", distribution="steam"),
+                    "gold-steam",
+                ),
+                GOLD_STEAM,
+            ),
+            (GameMetadataToPatch("3", GameMetadataId(), "any"), ANY),
+            (GameMetadataToPatch("4", GameMetadataId(language="de"), "any"), ANY),
+        ]
+    )
+
+
+def test_exact_and_wildcard_matches() -> None:
+    index = create_index()
+
+    patches = index.applicable_patches(
+        GameMetadataId(edition="gold", distribution="steam", language="en")
+    )
+
+    assert patches == [GOLD, GOLD_STEAM, ANY]
+
+
+def test_value_mismatch_excludes_mapping() -> None:
+    index = create_index()
+
+    patches = index.applicable_patches(
+        GameMetadataId(edition="gold", distribution="gog")
+    )
+
+    assert patches == [GOLD, ANY]
+
+
+def test_unknown_value_matches_only_wildcards() -> None:
+    index = create_index()
+
+    assert index.applicable_patches(GameMetadataId(edition="classic")) == [ANY]
+
+
+def test_unset_fields_do_not_rule_out_mappings() -> None:
+    index = create_index()
+
+    assert index.applicable_patches(GameMetadataId()) == [GOLD, GOLD_STEAM, ANY]
+
+
+def test_results_are_memoized() -> None:
+    index = create_index()
+    metadata_id = GameMetadataId(edition="gold")
+
+    assert index.applicable_patches(metadata_id) is index.applicable_patches(
+        GameMetadataId(edition="gold")
+    )
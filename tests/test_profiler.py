@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from europa1400_manager.profiler import Profiler
+
+
+def test_pop_args_without_flags() -> None:
+    args = ["manager", "info", "show"]
+
+    assert Profiler.pop_args(args) == (False, None)
+    assert args == ["manager", "info", "show"]
+
+
+def test_pop_args_profile() -> None:
+    args = ["manager", "--profile", "info", "show"]
+
+    assert Profiler.pop_args(args) == (True, None)
+    assert args == ["manager", "info", "show"]
+
+
+def test_pop_args_trace() -> None:
+    args = ["manager", "info", "--profile-trace", "trace.json", "show"]
+
+    assert Profiler.pop_args(args) == (True, Path("trace.json"))
+    assert args == ["manager", "info", "show"]
+
+
+def test_pop_args_trace_with_equals() -> None:
+    args = ["manager", "--profile-trace=out/trace.json", "--profile", "info"]
+
+    assert Profiler.pop_args(args) == (True, Path("out/trace.json"))
+    assert args == ["manager", "info"]
+
+
+def test_pop_args_keeps_program_name() -> None:
+    args = ["--profile", "info"]
+
+    assert Profiler.pop_args(args) == (False, None)
+    assert args == ["--profile", "info"]
+
+
+def test_pop_args_trace_without_path() -> None:
+    args = ["manager", "info", "--profile-trace"]
+
+    assert Profiler.pop_args(args) == (False, None)
+    assert args == ["manager", "info", "--profile-trace"]
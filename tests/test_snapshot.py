@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from europa1400_manager.models import GameLanguage, GameLanguageTable
+from europa1400_manager.snapshot import DatabaseSnapshot
+
+TABLE = GameLanguageTable(
+    id="language",
+    name="Languages",
+    elements=[GameLanguage("de", "German"), GameLanguage("en", "English")],
+)
+
+
+def write_snapshot(path: Path) -> None:
+    snapshot = DatabaseSnapshot(path)
+    snapshot.put(GameLanguageTable, "hash", TABLE)
+    snapshot.save()
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    write_snapshot(tmp_path / "database.snapshot")
+
+    snapshot = DatabaseSnapshot(tmp_path / "database.snapshot")
+
+    assert snapshot.get(GameLanguageTable, "hash") == TABLE
+    assert snapshot.table_count == 1
+
+
+def test_changed_content_hash(tmp_path: Path) -> None:
+    write_snapshot(tmp_path / "database.snapshot")
+
+    snapshot = DatabaseSnapshot(tmp_path / "database.snapshot")
+
+    assert snapshot.get(GameLanguageTable, "other") is None
+
+
+def test_damaged_payload(tmp_path: Path) -> None:
+    path = tmp_path / "database.snapshot"
+    write_snapshot(path)
+    path.write_bytes(path.read_bytes()[:-1] + b"x")
+
+    assert DatabaseSnapshot(path).table_count == 0
+
+
+def test_outdated_header(tmp_path: Path) -> None:
+    path = tmp_path / "database.snapshot"
+    write_snapshot(path)
+    data = bytearray(path.read_bytes())
+    DatabaseSnapshot.HEADER.pack_into(
+        data,
+        0,
+        DatabaseSnapshot.MAGIC,
+        DatabaseSnapshot.VERSION + 1,
+        *DatabaseSnapshot.HEADER.unpack_from(data)[2:],
+    )
+    path.write_bytes(data)
+
+    assert DatabaseSnapshot(path).table_count == 0
+
+
+def test_other_schema(tmp_path: Path) -> None:
+    path = tmp_path / "database.snapshot"
+    write_snapshot(path)
+    data = bytearray(path.read_bytes())
+    magic, version, _, checksum = DatabaseSnapshot.HEADER.unpack_from(data)
+    DatabaseSnapshot.HEADER.pack_into(data, 0, magic, version, bytes(32), checksum)
+    path.write_bytes(data)
+
+    assert DatabaseSnapshot(path).table_count == 0
+
+
+def test_clear(tmp_path: Path) -> None:
+    path = tmp_path / "database.snapshot"
+    write_snapshot(path)
+
+    DatabaseSnapshot(path).clear()
+
+    assert not path.exists()